@@ -0,0 +1,32 @@
+import asyncio
+import json
+import os
+import sys
+import typing as t
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from libsb import ApiClient
+from libsb.typings import xJsonT
+
+# recorded /skyblock/auctions pages shared by the benchmarks, fetched once and reused
+CORPUS = Path(os.environ.get("LIBSB_CORPUS", Path(__file__).parent / "auctions.json"))
+
+async def _record(pages: int) -> t.List[xJsonT]:
+    async with ApiClient(os.environ.get("HAPIKEY", "")) as client:
+        result = []
+        for page in range(pages):
+            resp = await client.api_request("/skyblock/auctions", page=page)
+            if not resp.ok:
+                break
+            result.append(resp.json())
+        return result
+
+def load_pages(pages: int = 10) -> t.List[xJsonT]:
+    if not CORPUS.exists():
+        CORPUS.write_text(json.dumps(asyncio.run(_record(pages))))
+    return json.loads(CORPUS.read_text())[:pages]
+
+def load_auctions(pages: int = 10) -> t.List[xJsonT]:
+    return [x for page in load_pages(pages) for x in page["auctions"]]
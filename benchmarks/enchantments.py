@@ -0,0 +1,35 @@
+import difflib
+import sys
+import timeit
+import typing as t
+
+from corpus import load_auctions
+from libsb import ApiClient, Enchantment, EnchantmentType, Item
+
+# EnchantmentType.parse before the lookup tables: a difflib scan over every member per enchantment
+def legacy_parse(enchant: str) -> EnchantmentType:
+    enchants = {
+        "luck_of_the_sea": EnchantmentType.LuckOfTheSea,
+        "ultimate_wise": EnchantmentType.UltimateWise,
+    }
+    enchant = enchant.replace("ultimate_", "")
+    if enchant in enchants.keys():
+        return enchants[enchant]
+    matches = difflib.get_close_matches(enchant, [x.name for x in EnchantmentType])
+    if matches:
+        return getattr(EnchantmentType, matches[0])
+    return EnchantmentType.Unknown
+
+def legacy_enchantments(item: Item) -> t.List[Enchantment]:
+    info = item.parsed_item_bytes["tag"]["ExtraAttributes"]["enchantments"]
+    return [Enchantment(type=legacy_parse(k), tier=v) for k, v in info.items()]
+
+if __name__ == "__main__":
+    auctions = [ApiClient._dict_to_auction(x) for x in load_auctions(int(sys.argv[1]) if len(sys.argv) > 1 else 10)]
+    items = [x for x in auctions if "enchantments" in x.parsed_item_bytes["tag"].get("ExtraAttributes", {})]
+    enchantments = sum(len(x.parsed_item_bytes["tag"]["ExtraAttributes"]["enchantments"]) for x in items)
+    print(f"{len(auctions)} auctions, {len(items)} enchanted items, {enchantments} enchantments")
+    # Item.enchantments.func skips the per-instance cache so every round parses again
+    for label, func in [("legacy", legacy_enchantments), ("tables", Item.enchantments.func)]:
+        best = min(timeit.repeat(lambda: [func(x) for x in items], number=1, repeat=5))
+        print(f"{label:>8}: {best:.3f}s total, {best / max(enchantments, 1) * 1e6:.2f}us per enchantment")
@@ -0,0 +1,39 @@
+import json
+import sys
+import timeit
+import typing as t
+
+from corpus import load_pages
+from libsb import jsonfast
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+CHUNK = 16 * 1024 # about what one network read hands over
+
+def stdlib_page(body: bytes) -> t.List[t.Any]:
+    return json.loads(body)["auctions"]
+
+def streamed_page(body: bytes) -> t.List[t.Any]:
+    return list(jsonfast.iter_auction_entries(body[i:i + CHUNK] for i in range(0, len(body), CHUNK)))
+
+if __name__ == "__main__":
+    bodies = [json.dumps(x, separators=(",", ":")).encode() for x in load_pages(int(sys.argv[1]) if len(sys.argv) > 1 else 10)]
+    auctions = sum(len(json.loads(x)["auctions"]) for x in bodies)
+    print(f"{len(bodies)} pages, {sum(map(len, bodies)) / 1e6:.1f}MB, {auctions} auctions, jsonfast backend: {jsonfast.BACKEND}")
+    decoders: t.List[t.Tuple[str, t.Callable[[bytes], t.Any]]] = [("json", stdlib_page), ("stream", streamed_page)]
+    if orjson is not None:
+        decoders.append(("orjson", lambda x: orjson.loads(x)["auctions"]))
+    if msgspec is not None:
+        decoders.append(("msgspec", lambda x: msgspec.json.decode(x)["auctions"]))
+        decoders.append(("structs", jsonfast.decode_auction_page))
+    for label, func in decoders:
+        best = min(timeit.repeat(lambda: [func(x) for x in bodies], number=1, repeat=5))
+        print(f"{label:>8}: {best:.3f}s total, {best / max(auctions, 1) * 1e6:.2f}us per auction")
@@ -0,0 +1,31 @@
+import gc
+import sys
+import tracemalloc
+import typing as t
+
+from corpus import load_auctions
+from libsb import ApiClient, AuctionItem, utils
+
+def measure(label: str, build: t.Callable[[], t.List[AuctionItem]]) -> None:
+    utils.ITEM_BYTES_CACHE.clear()
+    gc.collect()
+    tracemalloc.start()
+    auctions = build()
+    gc.collect() # the decode cache is left as is, whatever it keeps alive counts too
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:>8}: {current / 2**20:8.1f} MiB held, {peak / 2**20:8.1f} MiB peak, {current / len(auctions):8.0f} B per auction")
+
+def compacted(raw: t.List[t.Any]) -> t.List[AuctionItem]:
+    auctions = [ApiClient._dict_to_auction(x) for x in raw]
+    for auction in auctions:
+        auction.compact()
+    return auctions
+
+if __name__ == "__main__":
+    raw = load_auctions(int(sys.argv[1]) if len(sys.argv) > 1 else 60)
+    print(f"{len(raw)} auctions")
+    measure("full", lambda: [ApiClient._dict_to_auction(x) for x in raw])
+    measure("compact", lambda: compacted(raw))
+    # lazy auctions keep their json entry alive, that memory is allocated before tracing starts
+    measure("lazy", lambda: [ApiClient._dict_to_lazy_auction(x) for x in raw])
@@ -0,0 +1,33 @@
+import base64
+import io
+import sys
+import timeit
+import typing as t
+
+import nbt.nbt as nbt
+
+from corpus import load_auctions
+from libsb import nbtreader
+
+# the decoder libsb used before nbtreader: build an NBTFile tree, then walk it
+def legacy_parse_item_bytes(raw: str) -> t.Any:
+    def parse_tag(tag: t.Any) -> t.Any:
+        if isinstance(tag, nbt.TAG_List):
+            return [parse_tag(i) for i in tag.tags]
+        elif isinstance(tag, nbt.TAG_Compound):
+            return {[s:=parse_tag(i), i.name][1]: "\n".join(s) if i.name.lower() == "lore" else legacy_parse_item_bytes(base64.b64encode(s).decode()) if isinstance(s, bytearray) else s for i in tag.tags}
+        else:
+            return tag.value
+    tag = nbt.NBTFile(fileobj = io.BytesIO(base64.b64decode(raw)))
+    return parse_tag(tag)
+
+def fast_parse_item_bytes(raw: str) -> t.Any:
+    return nbtreader.loads(base64.b64decode(raw))
+
+if __name__ == "__main__":
+    blobs = [x["item_bytes"] for x in load_auctions(int(sys.argv[1]) if len(sys.argv) > 1 else 10)]
+    mismatches = sum(legacy_parse_item_bytes(x) != fast_parse_item_bytes(x) for x in blobs)
+    print(f"{len(blobs)} item blobs, {mismatches} mismatches")
+    for func in [legacy_parse_item_bytes, fast_parse_item_bytes]:
+        best = min(timeit.repeat(lambda: [func(x) for x in blobs], number=1, repeat=5))
+        print(f"{func.__name__}: {best:.3f}s total, {best / len(blobs) * 1e6:.1f}us per item")
@@ -1,4 +1,15 @@
+from .bazaar import *
+from .catalogue import *
 from .client import *
 from .containers import *
 from .enums import *
 from .errors import *
+from .history import *
+from .httpcache import *
+from .identity import *
+from .index import *
+from .jsonfast import *
+from .levels import *
+from .lore import *
+from .snapshot import *
+from .table import *
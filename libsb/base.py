@@ -1,31 +1,208 @@
 import asyncio
+import contextlib
+import random
+import time
 import typing as t
+from concurrent.futures import Executor
+from dataclasses import dataclass
 from pathlib import Path
 
 from curl_cffi.requests import AsyncSession
+from curl_cffi.requests.exceptions import RequestException
+from curl_cffi.requests.models import Response
+
+from .httpcache import ResponseCache
+from .identity import IdentityCache
 
 TIMEOUT = 30
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Hypixel endpoints served without an api key, they are not rate limited per key either
+KEYLESS_PATHS = frozenset({"/skyblock/auctions", "/skyblock/auctions_ended", "/skyblock/bazaar", "/skyblock/firesales"})
+
+@dataclass
+class EndpointStats:
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    latency: float = 0.0
+    bytes: int = 0
+    first: float = 0.0
+    last: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        return self.latency / self.requests if self.requests else 0.0
+
+    @property
+    def throughput(self) -> float:
+        # completed requests per second between the first and the last one
+        elapsed = self.last - self.first
+        return self.requests / elapsed if elapsed > 0 else 0.0
+
+    def __repr__(self) -> str:
+        return f"<EndpointStats requests={self.requests}, errors={self.errors}, retries={self.retries}, mean_latency={self.mean_latency:.3f}s>"
+
+class RateLimiter:
+    # token bucket refilled from Hypixel's RateLimit-Limit / RateLimit-Remaining / RateLimit-Reset headers.
+    # only requests that send the api key go through it, keyless ones (auctions, resources) are never held back
+    def __init__(self) -> None:
+        self.limit: t.Optional[int] = None
+        self.remaining: t.Optional[int] = None
+        self.reset_at = 0.0
+
+    def __repr__(self) -> str:
+        return f"<RateLimiter remaining={self.remaining}/{self.limit}, reset_in={max(self.reset_at - time.monotonic(), 0):.1f}s>"
+
+    async def acquire(self) -> None:
+        while True:
+            now = time.monotonic()
+            if self.remaining is not None and now >= self.reset_at:
+                self.remaining = self.limit
+            if self.remaining is None or self.remaining > 0:
+                if self.remaining is not None:
+                    self.remaining -= 1
+                return
+            await asyncio.sleep(self.reset_at - now)
+
+    def update(self, headers: t.Mapping[str, str]) -> None:
+        try:
+            remaining = int(headers["RateLimit-Remaining"])
+            reset_at = time.monotonic() + int(headers["RateLimit-Reset"])
+        except (KeyError, ValueError):
+            return
+        if "RateLimit-Limit" in headers:
+            self.limit = int(headers["RateLimit-Limit"])
+        if self.remaining is None or reset_at > self.reset_at + 1:
+            self.remaining = remaining # new window
+        else:
+            self.remaining = min(self.remaining, remaining) # in-flight requests are already taken off locally
+        self.reset_at = reset_at
+
+    def block(self, seconds: float) -> None:
+        self.remaining = 0
+        self.reset_at = max(self.reset_at, time.monotonic() + seconds)
 
 class ClientBase:
-    def __init__(self, api_key: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        decode_executor: t.Optional[Executor] = None,
+        max_in_flight: int = 16,
+        max_retries: int = 3,
+        backoff: float = 0.5,
+        response_cache: t.Optional[ResponseCache] = None,
+        identities: t.Optional[IdentityCache] = None,
+        fast_json: bool = False,
+    ) -> None:
         self.api_key = api_key
         self.base = "https://api.hypixel.net/v2"
-        self._uuid_cache: t.Dict[str, str] = {}
+        self.identities = identities if identities is not None else IdentityCache() # IdentityCache(path=...) to persist
         self._session = None
-        
+        self.decode_executor = decode_executor # see utils.decode_executor()
+        self.fast_json = fast_json # auction pages through orjson / msgspec when installed, see jsonfast
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.rate_limiter = RateLimiter()
+        self.stats: t.Dict[str, EndpointStats] = {}
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self.response_cache = response_cache
+        self._inflight: t.Dict[t.Hashable, asyncio.Future] = {} # see utils.single_flight
+
     @property
     def session(self) -> AsyncSession:
-        if self._session is None: 
+        if self._session is None:
             self._session = AsyncSession(impersonate="chrome110")
         self._session.headers.update({
             "Content-Type": "application/json",
-            "API-Key": self.api_key,
             "User-Agent": "Mozilla/5.0 sbClient v1.0",
         })
         return self._session
 
+    def _keyed(self, url: str) -> bool:
+        # Hypixel requests that need the api key, the only ones the rate limiter deals with
+        if not url.startswith(self.base):
+            return False
+        path = url[len(self.base):].split("?")[0]
+        return path not in KEYLESS_PATHS and not path.startswith("/resources/")
+
+    def _with_key(self, url: str, kwargs: t.Dict[str, t.Any]) -> t.Dict[str, t.Any]:
+        # the session is shared with Mojang and crafatar, the api key is only added where Hypixel needs it
+        if self._keyed(url):
+            kwargs["headers"] = {"API-Key": self.api_key, **(kwargs.get("headers") or {})}
+        return kwargs
+
+    def _delay(self, attempt: int, response: t.Optional[Response] = None) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after is not None and retry_after.isdigit():
+            return float(retry_after)
+        return random.uniform(0, self.backoff * 2 ** attempt) # full jitter
+
+    async def request(self, method: str, url: str, endpoint: t.Optional[str] = None, **kwargs) -> Response:
+        # every outgoing request goes through here: concurrency cap, rate limit, retries and stats
+        stats = self.stats.setdefault(endpoint or url.split("?")[0], EndpointStats())
+        keyed = self._keyed(url)
+        kwargs = self._with_key(url, kwargs)
+        attempt = 0
+        while True:
+            if keyed:
+                # before taking a slot, a coroutine waiting for the budget would otherwise hold one
+                # and stall requests to the other hosts
+                await self.rate_limiter.acquire()
+            async with self._semaphore:
+                start = time.monotonic()
+                try:
+                    response = await self.session.request(method, url, timeout=TIMEOUT, **kwargs)
+                except RequestException:
+                    response = None
+                    if attempt >= self.max_retries:
+                        stats.errors += 1
+                        raise
+                end = time.monotonic()
+            stats.first = stats.first or start
+            stats.requests, stats.latency, stats.last = stats.requests + 1, stats.latency + end - start, end
+            if response is not None:
+                stats.bytes += len(response.content)
+                if keyed:
+                    self.rate_limiter.update(response.headers)
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    if not response.ok:
+                        stats.errors += 1
+                    return response
+            delay = self._delay(attempt, response)
+            if keyed and response is not None and response.status_code == 429:
+                self.rate_limiter.block(delay) # other hosts only back off on this retry
+            stats.retries += 1
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    @contextlib.asynccontextmanager
+    async def stream(self, method: str, url: str, endpoint: t.Optional[str] = None, **kwargs) -> t.AsyncIterator[Response]:
+        # request() for a body read with aiter_content(). never retried since part of it may already
+        # be consumed, and the transfer keeps its concurrency slot until the body is done
+        stats = self.stats.setdefault(endpoint or url.split("?")[0], EndpointStats())
+        keyed = self._keyed(url)
+        kwargs = self._with_key(url, kwargs)
+        if keyed:
+            await self.rate_limiter.acquire() # outside the slot, same as request()
+        async with self._semaphore:
+            start = time.monotonic()
+            stats.first = stats.first or start
+            try:
+                async with self.session.stream(method, url, timeout=TIMEOUT, **kwargs) as response:
+                    if keyed:
+                        self.rate_limiter.update(response.headers)
+                    if not response.ok:
+                        stats.errors += 1
+                    yield response
+            except RequestException:
+                stats.errors += 1
+                raise
+            finally:
+                end = time.monotonic()
+                stats.requests, stats.latency, stats.last = stats.requests + 1, stats.latency + end - start, end
+
     async def __aenter__(self):
         return self
-    
+
     async def __aexit__(self, exc_type, exc_value, traceback):
-        return False
\ No newline at end of file
+        return False
@@ -0,0 +1,239 @@
+import asyncio
+import datetime
+import typing as t
+
+try:
+    import numpy as np
+except ImportError: # optional, only needed for the bazaar engine
+    np = None
+
+from .client import ApiClient
+from .typings import xJsonT
+
+__all__ = [
+    "OrderBook",
+    "Bazaar",
+]
+
+Side = t.Literal["buy", "sell"]
+
+def _column(summary: t.List[xJsonT], key: str, dtype: t.Any) -> "np.ndarray":
+    return np.fromiter((x[key] for x in summary), dtype=dtype, count=len(summary))
+
+def _fill(prices: "np.ndarray", amounts: "np.ndarray", amount: int) -> "np.ndarray":
+    # units taken from every order when walking the book for `amount` units
+    before = np.cumsum(amounts) - amounts
+    return np.clip(amount - before, 0, amounts)
+
+class OrderBook:
+    # one product. the buy side is Hypixel's buy_summary: sell offers, cheapest first, what an
+    # instant buy pays. the sell side is sell_summary: buy orders, highest first, what an instant sell gets
+    __slots__ = (
+        "product_id", "buy_prices", "buy_amounts", "buy_orders", "sell_prices", "sell_amounts", "sell_orders",
+        "buy_volume", "sell_volume", "buy_moving_week", "sell_moving_week",
+    )
+
+    def __init__(self, product_id: str, data: xJsonT) -> None:
+        if np is None:
+            raise ImportError("OrderBook requires numpy")
+        self.product_id = product_id
+        buy, sell, status = data["buy_summary"], data["sell_summary"], data["quick_status"]
+        self.buy_prices = _column(buy, "pricePerUnit", np.float64)
+        self.buy_amounts = _column(buy, "amount", np.int64)
+        self.buy_orders = _column(buy, "orders", np.int32)
+        self.sell_prices = _column(sell, "pricePerUnit", np.float64)
+        self.sell_amounts = _column(sell, "amount", np.int64)
+        self.sell_orders = _column(sell, "orders", np.int32)
+        self.buy_volume: int = status["buyVolume"]
+        self.sell_volume: int = status["sellVolume"]
+        self.buy_moving_week: int = status["buyMovingWeek"]
+        self.sell_moving_week: int = status["sellMovingWeek"]
+
+    def __repr__(self) -> str:
+        return f"<OrderBook {self.product_id} buy={self.instant_buy_price}, sell={self.instant_sell_price}>"
+
+    def side(self, side: Side) -> t.Tuple["np.ndarray", "np.ndarray"]:
+        if side == "buy":
+            return self.buy_prices, self.buy_amounts
+        return self.sell_prices, self.sell_amounts
+
+    @property
+    def instant_buy_price(self) -> t.Optional[float]:
+        return float(self.buy_prices[0]) if self.buy_prices.size else None
+
+    @property
+    def instant_sell_price(self) -> t.Optional[float]:
+        return float(self.sell_prices[0]) if self.sell_prices.size else None
+
+    @property
+    def spread(self) -> t.Optional[float]:
+        if not self.buy_prices.size or not self.sell_prices.size:
+            return None
+        return float(self.buy_prices[0] - self.sell_prices[0])
+
+    def depth(self, side: Side = "buy") -> int:
+        return int(self.side(side)[1].sum())
+
+    def vwap(self, amount: int, side: Side = "buy") -> t.Optional[float]:
+        # average unit price of filling `amount` units instantly, None if the visible book is too thin
+        prices, amounts = self.side(side)
+        filled = _fill(prices, amounts, amount)
+        if filled.sum() < amount:
+            return None
+        return float((filled * prices).sum() / amount)
+
+class Bazaar:
+    # /skyblock/bazaar as order books indexed by product id. refresh() only rebuilds the books whose
+    # quick_status moved since the last lastUpdated, bulk queries work on columns across all products
+    def __init__(self, client: ApiClient) -> None:
+        if np is None:
+            raise ImportError("Bazaar requires numpy")
+        self.client = client
+        self.products: t.Dict[str, OrderBook] = {}
+        self.last_updated: int = 0
+        self._fingerprints: t.Dict[str, t.Tuple[t.Any, ...]] = {}
+        self._columns: t.Optional[t.Tuple[t.List[str], "np.ndarray", "np.ndarray"]] = None
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self.products)
+
+    def __iter__(self) -> t.Iterator[OrderBook]:
+        return iter(self.products.values())
+
+    def __contains__(self, product_id: str) -> bool:
+        return product_id in self.products
+
+    def __getitem__(self, product_id: str) -> OrderBook:
+        return self.products[product_id]
+
+    def __repr__(self) -> str:
+        return f"<Bazaar products={len(self)}, lastUpdated={self.updated_at}>"
+
+    @property
+    def updated_at(self) -> t.Optional[datetime.datetime]:
+        return datetime.datetime.fromtimestamp(self.last_updated / 1000) if self.last_updated else None
+
+    def get(self, product_id: str) -> t.Optional[OrderBook]:
+        return self.products.get(product_id)
+
+    @staticmethod
+    def _fingerprint(data: xJsonT) -> t.Tuple[t.Any, ...]:
+        # volumes and order counts move with every order placed, filled or cancelled
+        buy, sell = data["buy_summary"], data["sell_summary"]
+        return (
+            *data["quick_status"].values(),
+            buy[0]["pricePerUnit"] if buy else None,
+            sell[0]["pricePerUnit"] if sell else None,
+        )
+
+    def update(self, data: xJsonT) -> t.List[str]:
+        # applies a /skyblock/bazaar body and returns the product ids whose books were rebuilt
+        changed = []
+        products = data["products"]
+        for product_id, product in products.items():
+            fingerprint = self._fingerprint(product)
+            if self._fingerprints.get(product_id) != fingerprint:
+                self.products[product_id] = OrderBook(product_id, product)
+                self._fingerprints[product_id] = fingerprint
+                changed.append(product_id)
+        for product_id in self.products.keys() - products.keys():
+            del self.products[product_id], self._fingerprints[product_id]
+            changed.append(product_id)
+        self.last_updated = data["lastUpdated"]
+        if changed:
+            self._columns = None
+        return changed
+
+    async def refresh(self) -> bool:
+        async with self._lock:
+            data = (await self.client.api_request("/skyblock/bazaar")).json()
+            if data["lastUpdated"] == self.last_updated:
+                return False
+            self.update(data)
+            return True
+
+    def _top(self) -> t.Tuple[t.List[str], "np.ndarray", "np.ndarray"]:
+        if self._columns is None:
+            ids = list(self.products)
+            buy = np.array([x.buy_prices[0] if x.buy_prices.size else np.nan for x in self.products.values()])
+            sell = np.array([x.sell_prices[0] if x.sell_prices.size else np.nan for x in self.products.values()])
+            self._columns = (ids, buy, sell)
+        return self._columns
+
+    def prices(self, side: Side = "buy") -> t.Dict[str, float]:
+        # instant price of every product that has orders on that side
+        ids, buy, sell = self._top()
+        column = buy if side == "buy" else sell
+        return {x: float(y) for x, y in zip(ids, column) if not np.isnan(y)}
+
+    def spreads(self) -> t.Dict[str, float]:
+        ids, buy, sell = self._top()
+        spread = buy - sell
+        return {x: float(y) for x, y in zip(ids, spread) if not np.isnan(y)}
+
+    def vwaps(self, amount: int, side: Side = "buy") -> t.Dict[str, float]:
+        # vwap() for every product in one pass over the concatenated books, products too thin to
+        # fill `amount` are left out
+        books = list(self.products.values())
+        sides = [x.side(side) for x in books]
+        lengths = np.array([x[0].size for x in sides])
+        if not lengths.sum():
+            return {}
+        prices = np.concatenate([x[0] for x in sides])
+        amounts = np.concatenate([x[1] for x in sides])
+        nonempty = lengths > 0
+        starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))[nonempty]
+        # cumulative amount restarted at every product boundary
+        before = np.cumsum(amounts) - amounts
+        before -= np.repeat(before[starts], lengths[nonempty])
+        filled = np.clip(amount - before, 0, amounts)
+        cost = np.add.reduceat(filled * prices, starts)
+        units = np.add.reduceat(filled, starts)
+        result = {}
+        for book, c, u in zip((x for x, y in zip(books, nonempty) if y), cost, units):
+            if u >= amount:
+                result[book.product_id] = float(c / amount)
+        return result
+
+    def craft_cost(self, ingredients: t.Mapping[str, float], instant: bool = True) -> t.Optional[float]:
+        # instant buys every ingredient off the cheapest sell offer, otherwise they are bought with
+        # buy orders matching the current best one
+        cost = 0.0
+        for product_id, quantity in ingredients.items():
+            book = self.products.get(product_id)
+            price = None if book is None else book.instant_buy_price if instant else book.instant_sell_price
+            if price is None:
+                return None
+            cost += price * quantity
+        return cost
+
+    def craft_margin(self, product_id: str, ingredients: t.Mapping[str, float], amount: float = 1, instant: bool = True) -> t.Optional[float]:
+        # profit of crafting `amount` units of product_id out of ingredients and selling it back,
+        # instantly or through a sell offer matching the current best one
+        book = self.products.get(product_id)
+        cost = self.craft_cost(ingredients, instant)
+        if book is None or cost is None:
+            return None
+        price = book.instant_sell_price if instant else book.instant_buy_price
+        if price is None:
+            return None
+        return price * amount - cost
+
+    def craft_margins(self, recipes: t.Mapping[str, t.Mapping[str, float]], instant: bool = True) -> t.Dict[str, float]:
+        # {product_id: {ingredient_id: quantity}} for one unit of product_id, recipes with an
+        # ingredient or output nobody trades are left out. sorted by margin, best first
+        ids, buy, sell = self._top()
+        index = {x: i for i, x in enumerate(ids)}
+        pay, receive = (buy, sell) if instant else (sell, buy)
+        outputs = [x for x in recipes if x in index and all(y in index for y in recipes[x])]
+        if not outputs:
+            return {}
+        rows = np.repeat(np.arange(len(outputs)), [len(recipes[x]) for x in outputs])
+        columns = np.array([index[y] for x in outputs for y in recipes[x]], dtype=np.int64)
+        quantities = np.array([q for x in outputs for q in recipes[x].values()], dtype=np.float64)
+        cost = np.zeros(len(outputs))
+        np.add.at(cost, rows, quantities * pay[columns])
+        margin = receive[[index[x] for x in outputs]] - cost
+        order = np.argsort(-margin, kind="stable")
+        return {outputs[i]: float(margin[i]) for i in order if not np.isnan(margin[i])}
@@ -0,0 +1,138 @@
+import difflib
+import gzip
+import json
+import os
+import time
+import typing as t
+from dataclasses import dataclass
+from pathlib import Path
+
+from .client import ApiClient
+from .enums import *
+from .index import normalize_name
+from .typings import xJsonT
+
+__all__ = [
+    "ItemRecord",
+    "ItemCatalogue",
+]
+
+CACHE_VERSION = 1
+
+@dataclass(slots=True)
+class ItemRecord:
+    id: str
+    name: str
+    rarity: ItemRarity
+    category: t.Optional[str]
+    material: t.Optional[str]
+    npc_sell_price: t.Optional[float]
+
+    @classmethod
+    def from_json(cls, x: xJsonT) -> "ItemRecord":
+        # items without a tier are common
+        return cls(
+            id=x["id"],
+            name=x["name"],
+            rarity=ItemRarity.parse(x.get("tier", "COMMON")),
+            category=x.get("category"),
+            material=x.get("material"),
+            npc_sell_price=x.get("npc_sell_price"),
+        )
+
+    def to_row(self) -> t.List[t.Any]:
+        return [self.id, self.name, self.rarity.value, self.category, self.material, self.npc_sell_price]
+
+    @classmethod
+    def from_row(cls, row: t.List[t.Any]) -> "ItemRecord":
+        return cls(row[0], row[1], ItemRarity.parse(row[2]), *row[3:])
+
+class ItemCatalogue:
+    # /resources/skyblock/items indexed by id and by normalized name. several items share a display
+    # name, for those the name index points at the first one listed
+    def __init__(self, records: t.Iterable[ItemRecord], last_updated: int = 0) -> None:
+        self.last_updated = last_updated
+        self.by_id: t.Dict[str, ItemRecord] = {}
+        self.by_name: t.Dict[str, str] = {}
+        for record in records:
+            self.by_id[record.id] = record
+            self.by_name.setdefault(normalize_name(record.name), record.id)
+        self._names = list(self.by_name)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __iter__(self) -> t.Iterator[ItemRecord]:
+        return iter(self.by_id.values())
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self.by_id
+
+    def __getitem__(self, item_id: str) -> ItemRecord:
+        return self.by_id[item_id]
+
+    def __repr__(self) -> str:
+        return f"<ItemCatalogue items={len(self)}, lastUpdated={self.last_updated}>"
+
+    def get(self, item_id: str) -> t.Optional[ItemRecord]:
+        return self.by_id.get(item_id)
+
+    def resolve(self, key: str) -> t.Optional[str]:
+        # item id for an id or an exact display name, use search() for anything looser
+        if key in self.by_id:
+            return key
+        return self.by_name.get(normalize_name(key))
+
+    def search(self, query: str, limit: int = 10, cutoff: float = 0.6) -> t.List[ItemRecord]:
+        # exact name first, then names starting with or containing the query, then close matches
+        query = normalize_name(query)
+        names: t.Dict[str, None] = {}
+        if query in self.by_name:
+            names[query] = None
+        for name in self._names:
+            if name.startswith(query):
+                names[name] = None
+        for name in self._names:
+            if query in name:
+                names[name] = None
+        if len(names) < limit:
+            for name in difflib.get_close_matches(query, self._names, n=limit, cutoff=cutoff):
+                names[name] = None
+        return [self.by_id[self.by_name[x]] for x in list(names)[:limit]]
+
+    @classmethod
+    def from_json(cls, data: xJsonT) -> "ItemCatalogue":
+        return cls(map(ItemRecord.from_json, data["items"]), data.get("lastUpdated", 0))
+
+    def save(self, path: t.Union[str, Path]) -> None:
+        data = {"version": CACHE_VERSION, "lastUpdated": self.last_updated, "items": [x.to_row() for x in self]}
+        with gzip.open(path, "wt", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path: t.Union[str, Path]) -> t.Optional["ItemCatalogue"]:
+        # None when the file is missing, unreadable or written by another cache version
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != CACHE_VERSION:
+            return None
+        return cls(map(ItemRecord.from_row, data["items"]), data["lastUpdated"])
+
+    @classmethod
+    async def fetch(cls, client: ApiClient, path: t.Union[str, Path, None] = None, max_age: float = 3600) -> "ItemCatalogue":
+        # with a path, a cache file younger than max_age is used as is. an older one is kept if the
+        # resource's lastUpdated has not moved and rewritten otherwise
+        cached = cls.load(path) if path is not None else None
+        if cached is not None and time.time() - os.path.getmtime(path) < max_age:
+            return cached
+        data = (await client.api_request("/resources/skyblock/items")).json()
+        if cached is not None and cached.last_updated == data.get("lastUpdated"):
+            os.utime(path)
+            return cached
+        catalogue = cls.from_json(data)
+        if path is not None:
+            catalogue.save(path)
+        return catalogue
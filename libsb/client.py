@@ -1,30 +1,85 @@
 import asyncio
 import collections
 import datetime
+import functools
 import json
 import typing as t
+from concurrent.futures import Executor
 from io import BytesIO
 
-import bs4
 from curl_cffi.requests.models import Response
 
-from . import utils
+from . import jsonfast, utils
 from .base import ClientBase
 from .containers import *
 from .enums import *
 from .errors import *
+from .httpcache import CachedResponse
+from .identity import name_key, uuid_key
+from .lore import analyze_lore
 from .typings import xJsonT
 
+if t.TYPE_CHECKING:
+    from .catalogue import ItemCatalogue
+
 __all__ = [
     "ApiClient",
 ]
 
+T = t.TypeVar("T")
+
+MOJANG_BULK_URL = "https://api.minecraftservices.com/minecraft/profile/lookup/bulk/byname"
+MOJANG_PROFILE_URL = "https://sessionserver.mojang.com/session/minecraft/profile/"
+MOJANG_BULK_LIMIT = 10 # names per bulk request
+
+# module level so they can be pickled into a ProcessPoolExecutor
+def _decode_auctions(data: t.List[xJsonT], lazy: bool = False, compact: bool = False) -> t.List[AuctionItem]:
+    if lazy:
+        return [ApiClient._dict_to_lazy_auction(x) for x in data]
+    auctions = [ApiClient._dict_to_auction(x) for x in data]
+    if compact: # in the worker, so only the trimmed NBT is pickled back
+        for auction in auctions:
+            auction.compact()
+    return auctions
+
+def _auction_page(content: bytes, fast: bool = False) -> t.Tuple[xJsonT, t.List[xJsonT]]:
+    # (top level keys, auctions) of a /skyblock/auctions body, the auctions are typed when fast_json
+    # is on and msgspec installed
+    if fast:
+        return jsonfast.split_auction_page(content)
+    data = json.loads(content)
+    return data, data.pop("auctions")
+
+def _decode_auction_page(content: bytes, lazy: bool = False, fast: bool = False) -> t.List[AuctionItem]:
+    return _decode_auctions(_auction_page(content, fast)[1], lazy)
+
 class ApiClient(ClientBase):
 
-    async def api_request(self, path: str, method: str = "GET", **kwargs) -> Response:
-        url = f"{self.base}{path}"
-        ns = "".join([f"?{x}={y}" for x, y in kwargs.items() if y is not None])
-        request = await self.session.request(method, url + ns)
+    async def api_request(self, path: str, method: str = "GET", **kwargs) -> t.Union[Response, CachedResponse]:
+        params = {x: y for x, y in kwargs.items() if y is not None}
+        cache, policy = self.response_cache, None
+        if cache is not None and method == "GET":
+            policy = cache.policy(path)
+        if cache is None or policy is None:
+            return self._check_response(await self.request(method, f"{self.base}{path}", endpoint=path, params=params))
+        key = cache.key(path, params)
+        entry = cache.lookup(key)
+        if entry is not None and entry.fresh:
+            return entry.response()
+        headers = entry.validators() if entry is not None else {}
+        request = self._check_response(await self.request(method, f"{self.base}{path}", endpoint=path, params=params, headers=headers))
+        if request.status_code == 304 and entry is not None:
+            return cache.refresh(key, policy, entry).response()
+        if request.status_code == 200:
+            return cache.store(key, policy, request.status_code, request.content, request.headers).response()
+        return request
+
+    def _json(self, resp: t.Union[Response, CachedResponse]) -> t.Any:
+        # resp.json() through jsonfast.loads when fast_json is on, for the auction endpoints
+        return jsonfast.loads(resp.content) if self.fast_json else resp.json()
+
+    @staticmethod
+    def _check_response(request: Response) -> Response:
         if request.status_code == 403:
             resp = request.json()
             raise InvalidApiKey(code=request.status_code, description=resp["cause"])
@@ -59,65 +114,72 @@ class ApiClient(ClientBase):
         items = [NewsItem(item=x["item"], link=x["link"], text=x["text"], title=x["title"]) for x in data["items"]]
         return items
     
-    def _dict_to_item(self, x: xJsonT) -> Item:
+    @staticmethod
+    def _dict_to_item(x: xJsonT) -> Item:
         if not x and isinstance(x, dict):
             return Item.empty()
-        lore = x["tag"]["display"]["Lore"]
-        idata = utils.parse_item_data(lore)
+        lore = analyze_lore(x["tag"]["display"]["Lore"])
         return Item(
             name=utils.clear_text(x["tag"]["display"]["Name"]),
-            lore=utils.clear_text(lore),
-            rarity=ItemRarity.parse(idata["rarity"]),
-            type=ItemType.parse(idata["type"]),
-            gemstone_slots=self.parse_gemstones(lore),
+            lore=lore.text,
+            rarity=ItemRarity.parse(lore.rarity),
+            type=ItemType.parse(lore.type),
+            gemstone_slots=GemstoneSlot.from_codes(lore.gemstone_codes),
             parsed_item_bytes=x
         )
 
-    def _dict_to_auction(self, x: xJsonT) -> AuctionItem:
-        item_bytes = x["item_bytes"]
-        if isinstance(item_bytes, dict):
-            item_bytes = item_bytes["data"]
+    @staticmethod
+    def _auction_kwargs(x: xJsonT) -> xJsonT:
+        # everything that comes straight from the auction json, no NBT or lore involved
         is_bin = x.get("bin", False)
-        parsed_item_bytes = utils.parse_item_bytes(item_bytes)["i"][0]
-        display = parsed_item_bytes["tag"]["display"]
-        lore = x["item_lore"] if "item_lore" in x.keys() else display["Lore"]
-        data = utils.parse_item_data(lore)
-        return AuctionItem(
+        return dict(
             uuid=x["uuid"] if "uuid" in x.keys() else x["auction_id"], 
-            seller=PartialPlayer(uuid=x["auctioneer"]) if "auctioneer" in x.keys() else PartialPlayer(uuid=x["seller"]), 
+            seller=PartialPlayer.shared(x["auctioneer"]) if "auctioneer" in x.keys() else PartialPlayer.shared(x["seller"]), 
             profile=x["profile_id"] if "profile_id" in x.keys() else x["seller_profile"], 
-            coop=[PartialPlayer(uuid=z) for z in x["coop"]] if "coop" in x.keys() else [],
+            coop=[PartialPlayer.shared(z) for z in x["coop"]] if "coop" in x.keys() else [],
             started=utils.get_date(x["start"]) if "start" in x.keys() else datetime.datetime.fromtimestamp(0),
             expires_at=utils.get_date(x["end"]) if "end" in x.keys() else utils.get_date(x["timestamp"]),
-            rarity=ItemRarity.parse(data["rarity"]),
             starting_bid=utils.CuteInt(x["starting_bid"]) if "starting_bid" in x.keys() else utils.CuteInt(x["price"]),
-            parsed_item_bytes=parsed_item_bytes,
-            lore=lore,
-            name=x["item_name"] if "item_name" in x.keys() else display["Name"],
             highest_bid=utils.CuteInt(x["highest_bid_amount"]) if "highest_bid_amount" in x.keys() else utils.CuteInt(x["price"]),
-            bids=[
-                AuctionBid(bidder=PartialPlayer(uuid=z["bidder"]), auction_id=z["auction_id"], amount=utils.CuteInt(z["amount"]), bid_at=utils.get_date(z["timestamp"]))
-                for z in x["bids"]
-            ] if "bids" in data.keys() else [],
             is_bin=is_bin,
-            gemstone_slots=self.parse_gemstones(lore),
             expired=int(datetime.datetime.now().timestamp()) > int(str(x["end"])[:-3]) if "end" in x.keys() else True,
             sold=((is_bin and not not x["bids"]) or (not is_bin and int(datetime.datetime.now().timestamp()) > int(str(x["end"])[:-3]))) if "end" in x.keys() else True,
-            type=ItemType.parse(data["type"])
+        )
+
+    @staticmethod
+    def _dict_to_auction(x: xJsonT) -> AuctionItem:
+        item_bytes = x["item_bytes"]
+        if isinstance(item_bytes, dict):
+            item_bytes = item_bytes["data"]
+        parsed_item_bytes = utils.parse_item_bytes(item_bytes)["i"][0]
+        display = parsed_item_bytes["tag"]["display"]
+        lore = x["item_lore"] if "item_lore" in x.keys() else display["Lore"]
+        analysis = analyze_lore(lore)
+        return AuctionItem(
+            **ApiClient._auction_kwargs(x),
+            rarity=ItemRarity.parse(analysis.rarity),
+            parsed_item_bytes=parsed_item_bytes,
+            lore=lore,
+            name=x["item_name"] if "item_name" in x.keys() else display["Name"],
+            bids=AuctionBid.from_list(x["bids"]) if "bids" in x.keys() else [],
+            gemstone_slots=GemstoneSlot.from_codes(analysis.gemstone_codes),
+            type=ItemType.parse(analysis.type)
         ) 
+
+    @staticmethod
+    def _dict_to_lazy_auction(x: xJsonT) -> LazyAuctionItem:
+        return LazyAuctionItem(x, **ApiClient._auction_kwargs(x))
     
     async def fetch_auctions(self, name: str, profile: t.Optional[str] = None) -> t.List[AuctionItem]:
         player = await self.name_to_uuid(name)
-        data = (await self.api_request("/skyblock/auction", player=player, profile=profile)).json()
+        data = self._json(await self.api_request("/skyblock/auction", player=player, profile=profile))
         return [self._dict_to_auction(x) for x in data["auctions"] if not x["claimed"]]
     
-    async def cata_stats(self, ign: str, profile: t.Optional[str] = None) -> CatacombsStats:
-        uuid = await self.name_to_uuid(ign)
-        profiles, player = await asyncio.gather(
-            self.api_request("/skyblock/profiles", uuid=uuid, profile=profile), 
-            self.api_request("/player", uuid=uuid)
-        )
-        data, playerdata, ret = profiles.json(), player.json(), {}
+    @staticmethod
+    def _catacombs_stats(uuid: str, data: xJsonT, playerdata: xJsonT) -> CatacombsStats:
+        # data is a /skyblock/profiles body and playerdata a /player body. both are parsed whole by the
+        # caller, from the profiles only the selected profile's member dungeons are read
+        ret = {}
         secrets = playerdata["player"]["achievements"]["skyblock_treasure_hunter"]
         for x in data["profiles"]:
             if x["selected"]:
@@ -135,86 +197,243 @@ class ApiClient(ClientBase):
                 )
         raise UnknownError("No profile selected or no profiles?")
 
+    async def _fetch_catacombs_stats(self, uuid: str, profile: t.Optional[str] = None) -> CatacombsStats:
+        profiles, player = await asyncio.gather(
+            self.api_request("/skyblock/profiles", uuid=uuid, profile=profile), 
+            self.api_request("/player", uuid=uuid)
+        )
+        return self._catacombs_stats(uuid, profiles.json(), player.json())
+
+    @utils.single_flight(normalize={"ign": name_key})
+    async def cata_stats(self, ign: str, profile: t.Optional[str] = None) -> CatacombsStats:
+        uuid = await self.name_to_uuid(ign)
+        return await self._fetch_catacombs_stats(uuid, profile)
+
+    async def cata_stats_many(self, names: t.Iterable[str], max_in_flight: int = 8) -> t.AsyncIterator[t.Tuple[str, t.Union[CatacombsStats, Exception]]]:
+        # (name, stats) in completion order. names are resolved in bulk first, a player that fails
+        # (including a failed name lookup) yields its exception instead of ending the stream, an
+        # invalid api key still raises
+        names = list(dict.fromkeys(names))
+        errors: t.Dict[str, Exception] = {}
+        uuids = await self.resolve_uuids(names, errors=errors)
+        semaphore = asyncio.Semaphore(max_in_flight)
+        async def fetch(name: str) -> t.Tuple[str, t.Union[CatacombsStats, Exception]]:
+            uuid = uuids.get(name)
+            if name in errors:
+                return name, errors[name]
+            if uuid is None:
+                return name, HTTPError(404, f"No player named {name}")
+            try:
+                async with semaphore:
+                    return name, await self._fetch_catacombs_stats(uuid)
+            except InvalidApiKey:
+                raise
+            except Exception as e:
+                return name, e
+        pending = [asyncio.ensure_future(fetch(name)) for name in names]
+        try:
+            for future in asyncio.as_completed(pending):
+                yield await future
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def resolve_uuids(self, names: t.Iterable[str], max_in_flight: int = 4, errors: t.Optional[t.Dict[str, Exception]] = None) -> t.Dict[str, str]:
+        # name -> uuid, cached pairs are answered locally and the rest goes to Mojang's bulk
+        # endpoint ten names at a time. names nobody owns are left out of the result. a failed batch
+        # puts its exception in `errors` for each of its names and the other batches still come back,
+        # without an errors dict the first failure is raised once every batch is done
+        names = list(dict.fromkeys(names))
+        found: t.Dict[str, str] = {}
+        missing: t.Dict[str, str] = {}
+        failed: t.Dict[str, Exception] = {}
+        for name in names:
+            uuid = self.identities.uuid_for(name)
+            if uuid is not None:
+                found[name.casefold()] = uuid
+            else:
+                missing.setdefault(name.casefold(), name)
+        semaphore = asyncio.Semaphore(max_in_flight)
+        async def lookup(batch: t.List[str]) -> None:
+            try:
+                async with semaphore:
+                    resp = await self.request("POST", MOJANG_BULK_URL, endpoint="mojang/bulk/byname", json=batch)
+                if not resp.ok:
+                    raise HTTPError(resp.status_code, resp.text)
+                profiles = resp.json()
+            except Exception as e:
+                failed.update((name.casefold(), e) for name in batch)
+                return
+            for profile in profiles:
+                self.identities.put(profile["id"], profile["name"])
+                found[profile["name"].casefold()] = profile["id"]
+        await asyncio.gather(*(lookup(batch) for batch in utils.as_chunks([*missing.values()], MOJANG_BULK_LIMIT)))
+        self._report({name: failed[name.casefold()] for name in names if name.casefold() in failed}, errors)
+        return {name: found[name.casefold()] for name in names if name.casefold() in found}
+
+    async def resolve_names(self, uuids: t.Iterable[str], max_in_flight: int = 8, errors: t.Optional[t.Dict[str, Exception]] = None) -> t.Dict[str, str]:
+        # uuid -> current name, Mojang has no bulk endpoint this way round so the misses are
+        # looked up concurrently. unknown uuids are left out of the result, failures are handled
+        # like in resolve_uuids()
+        uuids = list(dict.fromkeys(uuids))
+        result: t.Dict[str, str] = {}
+        failed: t.Dict[str, Exception] = {}
+        semaphore = asyncio.Semaphore(max_in_flight)
+        async def lookup(uuid: str) -> None:
+            try:
+                async with semaphore:
+                    resp = await self.request("GET", MOJANG_PROFILE_URL + uuid.replace("-", ""), endpoint="mojang/profile")
+                if resp.status_code in (204, 404):
+                    return
+                if not resp.ok:
+                    raise HTTPError(resp.status_code, resp.text)
+                profile = resp.json()
+            except Exception as e:
+                failed[uuid] = e
+                return
+            self.identities.put(profile["id"], profile["name"])
+            result[uuid] = profile["name"]
+        misses = []
+        for uuid in uuids:
+            name = self.identities.name_for(uuid)
+            if name is not None:
+                result[uuid] = name
+            else:
+                misses.append(uuid)
+        await asyncio.gather(*(lookup(uuid) for uuid in misses))
+        self._report(failed, errors)
+        return {uuid: result[uuid] for uuid in uuids if uuid in result}
+
+    @staticmethod
+    def _report(failed: t.Dict[str, Exception], errors: t.Optional[t.Dict[str, Exception]]) -> None:
+        if errors is not None:
+            errors.update(failed)
+        elif failed:
+            raise next(iter(failed.values()))
+
+    @utils.single_flight(normalize={"name": name_key})
     async def name_to_uuid(self, name: str) -> str:
-        if name in self._uuid_cache.values():
-            return [key for key in self._uuid_cache.items() if key[1] == name][0][0]
-        r = await self.session.request("GET", f"https://mcuuid.net/?q={name}") # TODO api.mojang.com
-        soup = bs4.BeautifulSoup(r.text, "lxml")
-        tag = soup.find("input", {"id": "results_raw_id"})
-        if tag is not None:
-            uuid = getattr(tag, "attrs")["value"]
-            self._uuid_cache[uuid] = name
-            return uuid
-        raise HTTPError(500, "Tag not found")
+        uuid = (await self.resolve_uuids([name])).get(name) # a failed lookup raises
+        if uuid is None:
+            raise HTTPError(404, f"No player named {name}")
+        return uuid
     
+    @utils.single_flight(normalize={"uuid": uuid_key})
     async def uuid_to_name(self, uuid: str) -> str:
-        if uuid in self._uuid_cache.keys():
-            return self._uuid_cache[uuid]
-        resp = await self.session.request("GET", f"https://mcuuid.net/?q={uuid}") # TODO api.mojang.com
-        try:
-            soup = bs4.BeautifulSoup(resp.text, "lxml")
-            name = soup.find_all("input")[1].attrs.get("value")
-            self._uuid_cache[uuid] = name
-            return name
-        except (Exception, KeyError, IndexError) as e:
-            print(e.__class__, e)
-            print(resp.text)
-            raise RuntimeError(self.uuid_to_name.__name__) from e
+        name = (await self.resolve_names([uuid])).get(uuid) # a failed lookup raises
+        if name is None:
+            raise HTTPError(404, f"No player with uuid {uuid}")
+        return name
     
     async def render_skin(self, uuid: str) -> BytesIO:
-        response = await self.session.request("GET", f"https://crafatar.com/renders/body/{uuid}?overlay=true")
+        response = await self.request("GET", f"https://crafatar.com/renders/body/{uuid}", endpoint="crafatar/renders/body", params={"overlay": "true"})
         if response.status_code == 200:
             _io = BytesIO(response.content)
             return [_io.seek(0), _io][1]
         else:
             raise HTTPError(response.status_code)
 
-    def parse_gemstones(self, lore: str) -> t.List[GemstoneSlot]:
-        result: t.List[str] = utils.GEMSTONE_PATTERN.findall(lore)
-        if result is not None:
-            groups = [x.split("§") for x in result]
-            slots = sum(x[2][:-1] != "8" for x in groups)
-            if slots:
-                gemstones = [
-                    GemstoneSlot(Gemstone(GemstoneQuality.parse(x[1]), GemstoneType.parse(x[2]))) 
-                    if x[2][0] != "7" else GemstoneSlot.empty() 
-                    for x in groups
-                ]
-                return gemstones
-        return []
+    @staticmethod
+    def parse_gemstones(lore: str) -> t.List[GemstoneSlot]:
+        return GemstoneSlot.from_lore(lore)
     
-    async def fetch_all_auctions(self, fetch_all: bool = True) -> t.List[AuctionItem]:
-        resp = await self.api_request("/skyblock/auctions", page=0)
-        page_0 = resp.json()
-        auctions = [self._dict_to_auction(x) for x in page_0["auctions"]]
+    async def _run_decoder(self, executor: t.Optional[Executor], func: t.Callable[[t.Any], t.List[AuctionItem]], arg: t.Any) -> t.List[AuctionItem]:
+        if executor is None:
+            return func(arg)
+        return await asyncio.get_running_loop().run_in_executor(executor, func, arg)
+
+    async def _iter_auction_pages(self, handler: t.Callable[[Response], t.Awaitable[T]], max_in_flight: t.Optional[int] = None, first: t.Optional[Response] = None, total_pages: t.Optional[int] = None) -> t.AsyncIterator[T]:
+        # runs handler (download + decode) for every page with at most max_in_flight pages pending,
+        # results are yielded in completion order
+        resp = first or await self.api_request("/skyblock/auctions", page=0)
+        pages = iter(range(1, total_pages if total_pages is not None else self._json(resp)["totalPages"]))
+        async def task(page: int) -> t.Optional[T]:
+            resp = await self.api_request("/skyblock/auctions", page=page)
+            return await handler(resp) if resp.ok else None
+        pending = {asyncio.ensure_future(handler(resp))}
+        def refill() -> None:
+            while max_in_flight is None or len(pending) < max_in_flight:
+                page = next(pages, None)
+                if page is None:
+                    break
+                pending.add(asyncio.ensure_future(task(page)))
+        try:
+            refill()
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                refill()
+                for future in done:
+                    result = future.result()
+                    if result is not None:
+                        yield result
+        finally:
+            for future in pending:
+                future.cancel()
+
+    async def iter_auction_pages(self, max_in_flight: t.Optional[int] = 8, executor: t.Optional[Executor] = None, lazy: bool = False) -> t.AsyncIterator[t.List[AuctionItem]]:
+        executor = executor or self.decode_executor
+        decoder = functools.partial(_decode_auction_page, lazy=lazy, fast=self.fast_json)
+        async def decode(resp: Response) -> t.List[AuctionItem]:
+            # raw body goes to the worker, json parsing happens there too
+            return await self._run_decoder(executor, decoder, resp.content)
+        async for page in self._iter_auction_pages(decode, max_in_flight):
+            yield page
+
+    async def iter_auctions(self, max_in_flight: t.Optional[int] = 8, executor: t.Optional[Executor] = None, lazy: bool = False) -> t.AsyncIterator[AuctionItem]:
+        async for page in self.iter_auction_pages(max_in_flight, executor, lazy):
+            for auction in page:
+                yield auction
+
+    async def stream_auctions(self, page: int = 0, lazy: bool = False) -> t.AsyncIterator[AuctionItem]:
+        # one page, every auction is yielded as soon as its json has arrived instead of after the
+        # whole body. goes around the response cache and is not retried
+        path = "/skyblock/auctions"
+        async with self.stream("GET", f"{self.base}{path}", endpoint=path, params={"page": page}) as resp:
+            if not resp.ok:
+                body = b"".join([x async for x in resp.aiter_content()])
+                if resp.status_code == 403:
+                    raise InvalidApiKey(code=resp.status_code, description=json.loads(body)["cause"])
+                raise HTTPError(resp.status_code, body.decode(errors="replace"))
+            decode = self._dict_to_lazy_auction if lazy else self._dict_to_auction
+            async for entry in jsonfast.aiter_auction_entries(resp.aiter_content()):
+                yield decode(entry)
+
+    async def fetch_all_auctions(self, fetch_all: bool = True, executor: t.Optional[Executor] = None, max_in_flight: t.Optional[int] = None, lazy: bool = False) -> t.List[AuctionItem]:
         if fetch_all:
-            tasks = []
-            async def task(page: int):
-                resp = await self.api_request("/skyblock/auctions", page=page)
-                if resp.ok:
-                    return [self._dict_to_auction(x) for x in resp.json()["auctions"]]
-                return []
-            for z in range(1, page_0["totalPages"] + 1):
-                tasks.append(task(z))
-            result = await asyncio.gather(*tasks)
-            return sum(result, []) + auctions
-        return auctions
-
-    def lowestbin_sort(self, name: str, auctions: t.List[AuctionItem]) -> t.List[AuctionItem]:
-        pred: t.Callable[[AuctionItem], bool] = lambda auction: name.lower() in auction.name.lower() and auction.is_alive and auction.is_bin
+            return [x async for page in self.iter_auction_pages(max_in_flight, executor, lazy) for x in page]
+        resp = await self.api_request("/skyblock/auctions", page=0)
+        decoder = functools.partial(_decode_auction_page, lazy=lazy, fast=self.fast_json)
+        return await self._run_decoder(executor or self.decode_executor, decoder, resp.content)
+
+    def lowestbin_sort(self, name: str, auctions: t.List[AuctionItem], catalogue: t.Optional["ItemCatalogue"] = None) -> t.List[AuctionItem]:
+        # with a catalogue a name it knows is matched by item id instead of by substring
+        item_id = catalogue.resolve(name) if catalogue is not None else None
+        def matches(auction: AuctionItem) -> bool:
+            if item_id is None:
+                return name.lower() in auction.name.lower()
+            try:
+                return auction.id == item_id
+            except KeyError:
+                return False
+        pred: t.Callable[[AuctionItem], bool] = lambda auction: matches(auction) and auction.is_alive and auction.is_bin
         items = sorted(filter(pred , auctions), key=lambda x: x.starting_bid)
         return items
     
+    @utils.single_flight(normalize={"uuid": uuid_key})
     async def auction_from_uuid(self, uuid: str) -> AuctionItem | None:
         resp = await self.api_request("/skyblock/auction", uuid=uuid)
-        data = resp.json()
+        data = self._json(resp)
         if resp.ok and data["auctions"]:
             return self._dict_to_auction(data["auctions"][0])
     
     async def ended_auctions(self) -> t.List[AuctionItem]:
         resp = await self.api_request("/skyblock/auctions_ended")
-        data = resp.json()["auctions"]
+        data = self._json(resp)["auctions"]
         return [self._dict_to_auction(item) for item in data]
+
+    async def ended_auction_ids(self) -> t.List[str]:
+        resp = await self.api_request("/skyblock/auctions_ended")
+        return [item["auction_id"] for item in self._json(resp)["auctions"]]
     
     async def fetch_inventory(self, name: str, profile: t.Optional[str] = None) -> t.List[t.List[Item]]:
         uuid = await self.name_to_uuid(name)
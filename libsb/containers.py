@@ -1,7 +1,8 @@
 import datetime
 import json
 import typing as t
-from dataclasses import dataclass
+import weakref
+from dataclasses import dataclass, field
 from functools import cached_property
 
 from PIL import Image
@@ -9,7 +10,8 @@ from PIL import Image
 from . import utils
 from .enums import *
 from .errors import *
-from .loreToImage.writer import LoreWriter
+from .lore import LoreAnalysis, analyze_lore
+from .loreToImage import cache as image_cache
 from .typings import xJsonT
 
 __all__ = [
@@ -18,6 +20,7 @@ __all__ = [
     "NewsItem",
     "AuctionBid",
     "AuctionItem",
+    "LazyAuctionItem",
     "GemstoneSlot",
     "Gemstone",
     "PartialPlayer",
@@ -56,7 +59,7 @@ class NewsItem:
     def __repr__(self) -> str:
         return f"<NewsItem link={self.link}, text={self.text}, item={self.item['material'].lower()}>"
 
-@dataclass
+@dataclass(slots=True)
 class AuctionBid:
     auction_id: str
     bidder: "PartialPlayer"
@@ -66,7 +69,18 @@ class AuctionBid:
     def __repr__(self) -> str:
         return f"<AuctionBid auction={self.auction_id}, amount={self.amount}, bidder={self.bidder}>"
 
-@dataclass
+    @classmethod
+    def from_list(cls, bids: t.List[xJsonT]) -> t.List["AuctionBid"]:
+        return [
+            cls(bidder=PartialPlayer.shared(z["bidder"]), auction_id=z["auction_id"], amount=utils.CuteInt(z["amount"]), bid_at=utils.get_date(z["timestamp"]))
+            for z in bids
+        ]
+
+# the parts of the item NBT that Item's properties read, see Item.compact()
+COMPACT_DISPLAY_KEYS = ("Name", "Lore")
+COMPACT_ATTRIBUTE_KEYS = ("id", "petInfo", "enchantments", "rarity_upgrades", "shiny", "dungeon_item")
+
+@dataclass(slots=True)
 class Item:
     name: str
     lore: str
@@ -74,6 +88,7 @@ class Item:
     gemstone_slots: t.List["GemstoneSlot"]
     parsed_item_bytes: xJsonT
     type: ItemType
+    _cache: t.Optional[t.Dict[str, t.Any]] = field(default=None, init=False, repr=False, compare=False)
 
     @property
     def count(self) -> int:
@@ -88,7 +103,7 @@ class Item:
             return "<Item Empty>"
         return f"<Item {self.name} x{self.count}>"
         
-    @cached_property
+    @utils.cached_slot
     def pet_level(self) -> int:
         if self.is_pet():
             return utils.get_pet_level(self.name)
@@ -98,9 +113,9 @@ class Item:
     def lore_with_name(self) -> str:
         return self.parsed_item_bytes["tag"]["display"]["Name"] + "\n" + self.parsed_item_bytes["tag"]["display"]["Lore"]
 
-    @cached_property
+    @utils.cached_slot
     def item_image(self) -> Image.Image:
-        return LoreWriter(self.lore_with_name).get_image()
+        return image_cache.IMAGE_CACHE.get(self.lore_with_name)
     
     @property
     def opened_gemstone_slots(self) -> int:
@@ -109,7 +124,7 @@ class Item:
     def is_pet(self) -> bool:
         return bool(self.parsed_item_bytes["tag"]["ExtraAttributes"].get("petInfo", False))
 
-    @cached_property
+    @utils.cached_slot
     def pet_exp(self) -> float | None:
         if self.is_pet():
             info = self.parsed_item_bytes["tag"]["ExtraAttributes"]["petInfo"]
@@ -117,7 +132,7 @@ class Item:
             return utils.CuteInt(round(exp, 3))
         raise IsNotAPet()
 
-    @cached_property
+    @utils.cached_slot
     def enchantments(self) -> t.List["Enchantment"]:
         info = self.parsed_item_bytes["tag"]["ExtraAttributes"]["enchantments"]
         return [Enchantment(type=EnchantmentType.parse(k), tier=v) for k, v in info.items()]
@@ -137,8 +152,25 @@ class Item:
     @property
     def is_dungeon_item(self) -> bool:
         return bool(self.parsed_item_bytes["tag"]["ExtraAttributes"].get("dungeon_item", False))
+
+    def compact(self) -> None:
+        # swaps the decoded NBT for a copy holding only what the properties above need. the full tree
+        # leaves the decode cache too, otherwise it stays alive there next to the copy
+        nbt = self.parsed_item_bytes
+        if not nbt:
+            return
+        utils.ITEM_BYTES_CACHE.discard(nbt)
+        tag = nbt.get("tag", {})
+        display, attributes = tag.get("display", {}), tag.get("ExtraAttributes", {})
+        self.parsed_item_bytes = {
+            "Count": nbt.get("Count", 1),
+            "tag": {
+                "display": {k: display[k] for k in COMPACT_DISPLAY_KEYS if k in display},
+                "ExtraAttributes": {k: attributes[k] for k in COMPACT_ATTRIBUTE_KEYS if k in attributes},
+            },
+        }
     
-@dataclass
+@dataclass(slots=True)
 class AuctionItem(Item):
     uuid: str
     seller: "PartialPlayer"
@@ -160,7 +192,71 @@ class AuctionItem(Item):
     def __repr__(self) -> str:
         return f"<AuctionItem name={self.name} price={self.starting_bid} alive={self.is_alive} rarity={self.rarity.name}>"
 
-@dataclass
+def _restore_lazy_auction(data: xJsonT, fields: xJsonT) -> "LazyAuctionItem":
+    return LazyAuctionItem(data, **fields)
+
+class LazyAuctionItem(AuctionItem):
+    # json fields are set right away, anything that needs NBT or lore parsing is decoded on first access
+    JSON_FIELDS = ("uuid", "seller", "profile", "coop", "started", "expires_at", "starting_bid", "highest_bid", "is_bin", "expired", "sold")
+
+    def __init__(self, data: xJsonT, **fields: t.Any) -> None:
+        self._data = data
+        self._cache = None
+        for k, v in fields.items():
+            setattr(self, k, v)
+        if "item_name" in data.keys():
+            self.name = data["item_name"]
+        if "item_lore" in data.keys():
+            self.lore = data["item_lore"]
+
+    def __reduce__(self) -> t.Tuple[t.Any, ...]:
+        # the slotted dataclass state only covers fields, so ship the raw json and decode again on the other side
+        return _restore_lazy_auction, (self._data, {k: getattr(self, k) for k in self.JSON_FIELDS})
+
+    def compact(self) -> None:
+        if "parsed_item_bytes" in self.__dict__:
+            AuctionItem.compact(self)
+
+    @cached_property
+    def parsed_item_bytes(self) -> xJsonT: # type: ignore
+        item_bytes = self._data["item_bytes"]
+        if isinstance(item_bytes, dict):
+            item_bytes = item_bytes["data"]
+        return utils.parse_item_bytes(item_bytes)["i"][0]
+
+    @cached_property
+    def name(self) -> str: # type: ignore
+        return self.parsed_item_bytes["tag"]["display"]["Name"]
+
+    @cached_property
+    def lore(self) -> str: # type: ignore
+        return self.parsed_item_bytes["tag"]["display"]["Lore"]
+
+    @cached_property
+    def _lore(self) -> LoreAnalysis:
+        return analyze_lore(self.lore)
+
+    @cached_property
+    def _item_data(self) -> xJsonT:
+        return self._lore.item_data
+
+    @cached_property
+    def rarity(self) -> ItemRarity: # type: ignore
+        return ItemRarity.parse(self._item_data["rarity"])
+
+    @cached_property
+    def type(self) -> ItemType: # type: ignore
+        return ItemType.parse(self._item_data["type"])
+
+    @cached_property
+    def gemstone_slots(self) -> t.List["GemstoneSlot"]: # type: ignore
+        return GemstoneSlot.from_codes(self._lore.gemstone_codes)
+
+    @cached_property
+    def bids(self) -> t.List[AuctionBid]: # type: ignore
+        return AuctionBid.from_list(self._data["bids"]) if "bids" in self._data.keys() else []
+
+@dataclass(slots=True)
 class Gemstone:
     quality: GemstoneQuality
     type: GemstoneType
@@ -168,7 +264,7 @@ class Gemstone:
     def __repr__(self) -> str:
         return f"<Gemstone {self.quality.name} {self.type.name}>"
 
-@dataclass
+@dataclass(slots=True)
 class GemstoneSlot:
     gemstone: t.Optional[Gemstone]
 
@@ -182,6 +278,23 @@ class GemstoneSlot:
     @classmethod
     def empty(cls):
         return cls(None)
+
+    @classmethod
+    def from_lore(cls, lore: str) -> t.List["GemstoneSlot"]:
+        return cls.from_codes(analyze_lore(lore).gemstone_codes)
+
+    @classmethod
+    def from_codes(cls, groups: t.List[t.Tuple[str, str]]) -> t.List["GemstoneSlot"]:
+        # see LoreAnalysis.gemstone_codes
+        slots = sum(x[1][:-1] != "8" for x in groups)
+        if slots:
+            gemstones = [
+                cls(Gemstone(GemstoneQuality.parse(x[0]), GemstoneType.parse(x[1]))) 
+                if x[1][0] != "7" else cls.empty() 
+                for x in groups
+            ]
+            return gemstones
+        return []
     
     @property
     def is_closed(self) -> bool:
@@ -189,13 +302,27 @@ class GemstoneSlot:
             and self.gemstone.quality is GemstoneQuality.Unknown \
             and self.gemstone.type is GemstoneType.Unknown
 
-@dataclass
+@dataclass(slots=True, weakref_slot=True)
 class PartialPlayer:
     uuid: str # TODO: extract info
 
+    _shared: t.ClassVar["weakref.WeakValueDictionary[str, PartialPlayer]"] = weakref.WeakValueDictionary()
+
     def __repr__(self) -> str:
         return f"<PartialPlayer uuid={self.uuid}>"
 
+    @classmethod
+    def shared(cls, uuid: str) -> "PartialPlayer":
+        # one instance per uuid for as long as anything references it
+        player = cls._shared.get(uuid)
+        if player is None:
+            player = cls._shared[uuid] = cls(uuid=uuid)
+        return player
+
+    def __reduce__(self) -> t.Tuple[t.Any, ...]:
+        # decoded in a worker process, unpickled into the parent's shared instance
+        return PartialPlayer.shared, (self.uuid,)
+
 @dataclass
 class Enchantment:
     type: EnchantmentType
@@ -1,4 +1,7 @@
 import difflib
+import functools
+import re
+import typing as t
 from enum import Enum
 
 __all__ = [
@@ -22,10 +25,7 @@ class GemstoneType(Enum):
     
     @classmethod
     def parse(cls, type: str) -> "GemstoneType":
-        for x in cls:
-            if type[0] == x.value:
-                return x
-        return cls.Unknown
+        return GEMSTONE_TYPES.get(type[0], cls.Unknown)
 
 class GemstoneQuality(Enum):
     Rough = "f"
@@ -37,10 +37,7 @@ class GemstoneQuality(Enum):
 
     @classmethod
     def parse(cls, type: str) -> "GemstoneQuality":
-        for x in cls:
-            if type[0] == x.value:
-                return x
-        return cls.Unknown
+        return GEMSTONE_QUALITIES.get(type[0], cls.Unknown)
 
 class ItemRarity(Enum):
     Common = "COMMON"
@@ -56,10 +53,7 @@ class ItemRarity(Enum):
 
     @classmethod
     def parse(cls, rarity: str) -> "ItemRarity":
-        for x in cls:
-            if rarity == x.value:
-                return x
-        return cls.Unknown
+        return ITEM_RARITIES.get(rarity, cls.Unknown)
 
 class ItemType(Enum):
     Helmet = "HELMET"
@@ -94,10 +88,7 @@ class ItemType(Enum):
 
     @classmethod
     def parse(cls, rarity: str) -> "ItemType":
-        for x in cls:
-            if rarity == x.value:
-                return x
-        return cls.Unknown
+        return ITEM_TYPES.get(rarity, cls.Unknown)
 
 class EnchantmentType(Enum):
     BaneOfArthropods = 0x0
@@ -233,14 +224,30 @@ class EnchantmentType(Enum):
 
     @classmethod
     def parse(cls, enchant: str) -> "EnchantmentType":
-        enchants = {
-            "luck_of_the_sea": cls.LuckOfTheSea,
-            "ultimate_wise": cls.UltimateWise,
-        }
-        enchant = enchant.replace("ultimate_", "")
-        if enchant in enchants.keys():
-            return enchants[enchant]
-        matches = difflib.get_close_matches(enchant, [x.name for x in cls])
-        if matches:
-            return getattr(cls, matches[0])
-        return cls.Unknown
\ No newline at end of file
+        # hypixel ids are the snake_case member names, ultimates may carry an ultimate_ prefix
+        member = ENCHANTMENTS.get(enchant)
+        if member is None:
+            member = ENCHANTMENTS.get(enchant.replace("ultimate_", ""))
+        if member is None:
+            member = _closest_enchantment(enchant.replace("ultimate_", ""))
+        return member
+
+# value -> member tables for the parse() classmethods above
+GEMSTONE_TYPES: t.Dict[str, GemstoneType] = {x.value: x for x in GemstoneType}
+GEMSTONE_QUALITIES: t.Dict[str, GemstoneQuality] = {x.value: x for x in GemstoneQuality}
+ITEM_RARITIES: t.Dict[str, ItemRarity] = {x.value: x for x in ItemRarity}
+ITEM_TYPES: t.Dict[str, ItemType] = {x.value: x for x in ItemType}
+
+def _snake_case(name: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+ENCHANTMENTS: t.Dict[str, EnchantmentType] = {
+    _snake_case(name): member for name, member in EnchantmentType.__members__.items() if member is not EnchantmentType.Unknown
+}
+
+@functools.lru_cache(maxsize=1024)
+def _closest_enchantment(enchant: str) -> EnchantmentType:
+    matches = difflib.get_close_matches(enchant, [x.name for x in EnchantmentType])
+    if matches:
+        return getattr(EnchantmentType, matches[0])
+    return EnchantmentType.Unknown
\ No newline at end of file
@@ -0,0 +1,121 @@
+import datetime
+import sqlite3
+import typing as t
+from pathlib import Path
+
+from . import utils
+from .containers import *
+
+__all__ = [
+    "AuctionHistory",
+]
+
+Moment = t.Union[datetime.datetime, datetime.timedelta, None]
+
+def item_id(auction: AuctionItem) -> t.Optional[str]:
+    try:
+        return auction.id
+    except KeyError:
+        return None
+
+def timestamp(moment: Moment) -> t.Optional[float]:
+    # a timedelta means that long ago
+    if moment is None:
+        return None
+    if isinstance(moment, datetime.timedelta):
+        moment = datetime.datetime.now() - moment
+    return moment.timestamp()
+
+def interpolate(prices: t.Sequence[int], q: float) -> float:
+    # same as numpy.percentile's default linear method, prices must be sorted
+    position = (len(prices) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(prices) - 1)
+    return prices[low] + (prices[high] - prices[low]) * (position - low)
+
+class AuctionHistory:
+    # every listing seen in a snapshot and every ended auction, keyed by auction uuid so ingesting
+    # the same data twice is harmless. sales are indexed by (item_id, sold_at) for window queries
+    def __init__(self, path: t.Union[str, Path] = "libsb_history.sqlite3") -> None:
+        self.connection = sqlite3.connect(str(path))
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS listings (
+                uuid TEXT PRIMARY KEY, item_id TEXT, name TEXT, seller TEXT, is_bin INTEGER,
+                starting_bid INTEGER, highest_bid INTEGER, started REAL, expires_at REAL, first_seen REAL, last_seen REAL
+            );
+            CREATE TABLE IF NOT EXISTS sales (
+                uuid TEXT PRIMARY KEY, item_id TEXT, name TEXT, seller TEXT, is_bin INTEGER, price INTEGER, sold_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS listings_item ON listings (item_id, last_seen);
+            CREATE INDEX IF NOT EXISTS sales_item ON sales (item_id, sold_at);
+        """)
+        self.connection.commit()
+
+    def __repr__(self) -> str:
+        listings, sales = self.connection.execute("SELECT (SELECT COUNT(*) FROM listings), (SELECT COUNT(*) FROM sales)").fetchone()
+        return f"<AuctionHistory listings={listings}, sales={sales}>"
+
+    def ingest_snapshot(self, auctions: t.Iterable[AuctionItem], seen_at: t.Optional[datetime.datetime] = None) -> int:
+        # takes fetch_all_auctions() output or an AuctionSnapshot, known listings only get their bid and last_seen bumped
+        seen = (seen_at or datetime.datetime.now()).timestamp()
+        rows = [
+            (
+                x.uuid, item_id(x), utils.clear_text(x.name), x.seller.uuid, x.is_bin, int(x.starting_bid),
+                int(x.highest_bid), x.started.timestamp(), x.expires_at.timestamp(), seen, seen,
+            )
+            for x in auctions
+        ]
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO listings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (uuid) DO UPDATE SET highest_bid = excluded.highest_bid, last_seen = excluded.last_seen",
+                rows,
+            )
+        return len(rows)
+
+    def ingest_ended(self, auctions: t.Iterable[AuctionItem]) -> int:
+        # takes ended_auctions() output, returns how many sales were new
+        rows = [
+            (x.uuid, item_id(x), utils.clear_text(x.name), x.seller.uuid, x.is_bin, int(x.highest_bid), x.expires_at.timestamp())
+            for x in auctions
+        ]
+        with self.connection:
+            before = self.connection.total_changes
+            self.connection.executemany("INSERT OR IGNORE INTO sales VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+            return self.connection.total_changes - before
+
+    @staticmethod
+    def _window(item_id: str, since: Moment, until: Moment, bin: t.Optional[bool]) -> t.Tuple[str, t.List[t.Any]]:
+        query, args = "item_id = ?", [item_id]
+        if since is not None:
+            query, args = query + " AND sold_at >= ?", args + [timestamp(since)]
+        if until is not None:
+            query, args = query + " AND sold_at < ?", args + [timestamp(until)]
+        if bin is not None:
+            query, args = query + " AND is_bin = ?", args + [bin]
+        return query, args
+
+    def sold_prices(self, item_id: str, since: Moment = None, until: Moment = None, bin: t.Optional[bool] = None) -> t.List[int]:
+        # sorted ascending
+        where, args = self._window(item_id, since, until, bin)
+        return [x for x, in self.connection.execute(f"SELECT price FROM sales WHERE {where} ORDER BY price", args)]
+
+    def percentile(self, item_id: str, q: t.Union[float, t.Sequence[float]], since: Moment = None, until: Moment = None, bin: t.Optional[bool] = None) -> t.Union[float, t.List[float], None]:
+        prices = self.sold_prices(item_id, since, until, bin)
+        if not prices:
+            return None
+        if isinstance(q, (int, float)):
+            return interpolate(prices, q)
+        return [interpolate(prices, x) for x in q]
+
+    def median(self, item_id: str, since: Moment = None, until: Moment = None, bin: t.Optional[bool] = None) -> t.Optional[float]:
+        return self.percentile(item_id, 50, since, until, bin)
+
+    def volume(self, item_id: str, since: Moment = None, until: Moment = None, bin: t.Optional[bool] = None) -> int:
+        where, args = self._window(item_id, since, until, bin)
+        return self.connection.execute(f"SELECT COUNT(*) FROM sales WHERE {where}", args).fetchone()[0]
+
+    def close(self) -> None:
+        self.connection.close()
@@ -0,0 +1,200 @@
+import collections
+import json
+import sqlite3
+import time
+import typing as t
+from dataclasses import dataclass
+from pathlib import Path
+
+__all__ = [
+    "CachePolicy",
+    "CachedResponse",
+    "MemoryBackend",
+    "SQLiteBackend",
+    "ResponseCache",
+]
+
+@dataclass
+class CachePolicy:
+    ttl: float
+    # endpoints whose body carries lastUpdated and that refresh on a fixed period expire right when
+    # the next update is due instead of after a flat ttl
+    period: t.Optional[float] = None
+
+DEFAULT_POLICIES: t.Dict[str, CachePolicy] = {
+    "/resources/skyblock/election": CachePolicy(ttl=300),
+    "/resources/skyblock/items": CachePolicy(ttl=3600),
+    "/skyblock/news": CachePolicy(ttl=600),
+    "/skyblock/profiles": CachePolicy(ttl=60),
+    "/player": CachePolicy(ttl=60),
+    "/skyblock/bazaar": CachePolicy(ttl=20, period=20),
+    "/skyblock/auctions_ended": CachePolicy(ttl=60, period=60),
+}
+
+class Headers(t.Dict[str, str]):
+    # response headers with case-insensitive lookup. keys are stored lowercase, which is how curl_cffi
+    # and every HTTP/2 response hand them over anyway
+    def __init__(self, headers: t.Mapping[str, str] = {}) -> None:
+        super().__init__((k.lower(), v) for k, v in headers.items())
+
+    def __getitem__(self, key: str) -> str:
+        return super().__getitem__(key.lower())
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and super().__contains__(key.lower())
+
+    def get(self, key: str, default: t.Any = None) -> t.Any:
+        return super().get(key.lower(), default)
+
+class CachedResponse:
+    # the subset of curl_cffi's Response that callers of api_request use
+    def __init__(self, status_code: int, content: bytes, headers: t.Mapping[str, str]) -> None:
+        self.status_code = status_code
+        self.content = content
+        self.headers = Headers(headers)
+
+    def __repr__(self) -> str:
+        return f"<CachedResponse [{self.status_code}]>"
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode()
+
+    def json(self) -> t.Any:
+        return json.loads(self.content)
+
+@dataclass
+class CacheEntry:
+    status_code: int
+    content: bytes
+    headers: Headers
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def validators(self) -> t.Dict[str, str]:
+        result = {}
+        if "etag" in self.headers:
+            result["If-None-Match"] = self.headers["etag"]
+        if "last-modified" in self.headers:
+            result["If-Modified-Since"] = self.headers["last-modified"]
+        return result
+
+    def response(self) -> CachedResponse:
+        return CachedResponse(self.status_code, self.content, self.headers)
+
+class MemoryBackend:
+    def __init__(self, maxsize: int = 1024) -> None:
+        self.maxsize = maxsize
+        self._data: collections.OrderedDict[str, CacheEntry] = collections.OrderedDict()
+
+    def get(self, key: str) -> t.Optional[CacheEntry]:
+        entry = self._data.get(key)
+        if entry is not None:
+            self._data.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self._data[key] = entry
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+class SQLiteBackend:
+    def __init__(self, path: t.Union[str, Path] = "libsb_cache.sqlite3") -> None:
+        self.connection = sqlite3.connect(str(path))
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, status INTEGER, content BLOB, headers TEXT, expires_at REAL)"
+        )
+        self.connection.commit()
+
+    def get(self, key: str) -> t.Optional[CacheEntry]:
+        row = self.connection.execute("SELECT status, content, headers, expires_at FROM responses WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return CacheEntry(row[0], row[1], Headers(json.loads(row[2])), row[3])
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self.connection.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?)",
+            (key, entry.status_code, entry.content, json.dumps(entry.headers), entry.expires_at),
+        )
+        self.connection.commit()
+
+    def clear(self) -> None:
+        self.connection.execute("DELETE FROM responses")
+        self.connection.commit()
+
+class Backend(t.Protocol):
+    def get(self, key: str) -> t.Optional[CacheEntry]: ...
+    def set(self, key: str, entry: CacheEntry) -> None: ...
+    def clear(self) -> None: ...
+
+@dataclass
+class ResponseCacheInfo:
+    hits: int = 0
+    misses: int = 0
+    revalidated: int = 0
+    stores: int = 0
+
+class ResponseCache:
+    def __init__(self, backend: t.Optional[Backend] = None, policies: t.Optional[t.Dict[str, CachePolicy]] = None) -> None:
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.policies = {**DEFAULT_POLICIES, **(policies or {})}
+        self.stats = ResponseCacheInfo()
+
+    def __repr__(self) -> str:
+        return f"<ResponseCache {self.stats}>"
+
+    def policy(self, path: str) -> t.Optional[CachePolicy]:
+        return self.policies.get(path)
+
+    @staticmethod
+    def key(path: str, params: t.Mapping[str, t.Any]) -> str:
+        return path + "?" + "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+
+    def lookup(self, key: str) -> t.Optional[CacheEntry]:
+        entry = self.backend.get(key)
+        if entry is not None and entry.fresh:
+            self.stats.hits += 1
+        else:
+            self.stats.misses += 1
+        return entry
+
+    def _expiry(self, policy: CachePolicy, content: bytes) -> float:
+        now = time.time()
+        if policy.period is not None:
+            try:
+                last_updated = json.loads(content)["lastUpdated"] / 1000
+            except (ValueError, KeyError, TypeError):
+                pass
+            else:
+                if last_updated + policy.period > now:
+                    return last_updated + policy.period
+        return now + policy.ttl
+
+    def store(self, key: str, policy: CachePolicy, status_code: int, content: bytes, headers: t.Mapping[str, str]) -> CacheEntry:
+        entry = CacheEntry(status_code, content, Headers(headers), self._expiry(policy, content))
+        self.backend.set(key, entry)
+        self.stats.stores += 1
+        return entry
+
+    def refresh(self, key: str, policy: CachePolicy, entry: CacheEntry) -> CacheEntry:
+        # 304 Not Modified, the cached body is good for another round
+        entry.expires_at = time.time() + policy.ttl
+        self.backend.set(key, entry)
+        self.stats.revalidated += 1
+        return entry
+
+    def clear(self) -> None:
+        self.backend.clear()
+        self.stats = ResponseCacheInfo()
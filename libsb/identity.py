@@ -0,0 +1,111 @@
+import collections
+import sqlite3
+import time
+import typing as t
+from pathlib import Path
+
+__all__ = [
+    "IdentityCache",
+]
+
+def name_key(name: str) -> str:
+    return name.casefold()
+
+def uuid_key(uuid: str) -> str:
+    return uuid.replace("-", "").lower()
+
+class IdentityEntry(t.NamedTuple):
+    uuid: str
+    name: str
+    stored_at: float
+
+class IdentityCache:
+    # uuid <-> name in both directions with O(1) lookups. names are matched case-insensitively and
+    # expire after ttl seconds since players can rename, the least recently used pairs go first
+    # once maxsize is reached. with a path every pair is mirrored to sqlite for warm starts
+    def __init__(self, ttl: float = 24 * 3600, maxsize: int = 100_000, path: t.Union[str, Path, None] = None) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._by_uuid: collections.OrderedDict[str, IdentityEntry] = collections.OrderedDict()
+        self._by_name: t.Dict[str, str] = {}
+        self.connection: t.Optional[sqlite3.Connection] = None
+        if path is not None:
+            self.connection = sqlite3.connect(str(path))
+            self.connection.execute("CREATE TABLE IF NOT EXISTS identities (uuid TEXT PRIMARY KEY, name TEXT, stored_at REAL)")
+            self.connection.execute("DELETE FROM identities WHERE stored_at < ?", (time.time() - ttl,))
+            self.connection.commit()
+            rows = self.connection.execute("SELECT uuid, name, stored_at FROM identities ORDER BY stored_at DESC LIMIT ?", (maxsize,))
+            for uuid, name, stored_at in reversed(rows.fetchall()):
+                self._put(IdentityEntry(uuid, name, stored_at))
+
+    def __len__(self) -> int:
+        return len(self._by_uuid)
+
+    def __repr__(self) -> str:
+        return f"<IdentityCache entries={len(self)}, ttl={self.ttl}>"
+
+    def _expired(self, entry: IdentityEntry) -> bool:
+        return time.time() - entry.stored_at > self.ttl
+
+    def _get(self, key: str) -> t.Optional[IdentityEntry]:
+        entry = self._by_uuid.get(key)
+        if entry is None:
+            return None
+        if self._expired(entry):
+            self.discard(entry.uuid)
+            return None
+        self._by_uuid.move_to_end(key)
+        return entry
+
+    def name_for(self, uuid: str) -> t.Optional[str]:
+        entry = self._get(uuid_key(uuid))
+        return entry.name if entry is not None else None
+
+    def uuid_for(self, name: str) -> t.Optional[str]:
+        key = self._by_name.get(name_key(name))
+        entry = self._get(key) if key is not None else None
+        return entry.uuid if entry is not None else None
+
+    def _put(self, entry: IdentityEntry) -> t.List[str]:
+        # returns the uuids that were pushed out so the database can follow
+        removed = []
+        key = uuid_key(entry.uuid)
+        old = self._by_uuid.pop(key, None)
+        if old is not None and self._by_name.get(name_key(old.name)) == key:
+            del self._by_name[name_key(old.name)]
+        previous_owner = self._by_name.get(name_key(entry.name))
+        if previous_owner is not None and previous_owner != key:
+            # the name moved to another account, the old pairing is stale
+            removed.append(self._by_uuid.pop(previous_owner).uuid)
+        self._by_uuid[key] = entry
+        self._by_name[name_key(entry.name)] = key
+        while len(self._by_uuid) > self.maxsize:
+            _, evicted = self._by_uuid.popitem(last=False)
+            self._by_name.pop(name_key(evicted.name), None)
+            removed.append(evicted.uuid)
+        return removed
+
+    def put(self, uuid: str, name: str) -> None:
+        entry = IdentityEntry(uuid, name, time.time())
+        removed = self._put(entry)
+        if self.connection is not None:
+            self.connection.execute("INSERT OR REPLACE INTO identities VALUES (?, ?, ?)", entry)
+            self.connection.executemany("DELETE FROM identities WHERE uuid = ?", [(x,) for x in removed])
+            self.connection.commit()
+
+    def discard(self, uuid: str) -> None:
+        entry = self._by_uuid.pop(uuid_key(uuid), None)
+        if entry is None:
+            return
+        if self._by_name.get(name_key(entry.name)) == uuid_key(uuid):
+            del self._by_name[name_key(entry.name)]
+        if self.connection is not None:
+            self.connection.execute("DELETE FROM identities WHERE uuid = ?", (entry.uuid,))
+            self.connection.commit()
+
+    def clear(self) -> None:
+        self._by_uuid.clear()
+        self._by_name.clear()
+        if self.connection is not None:
+            self.connection.execute("DELETE FROM identities")
+            self.connection.commit()
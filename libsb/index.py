@@ -0,0 +1,113 @@
+import bisect
+import datetime
+import heapq
+import typing as t
+
+from . import utils
+from .containers import *
+
+__all__ = [
+    "LowestBinIndex",
+]
+
+def normalize_name(name: str) -> str:
+    return utils.clear_text(name).strip().lower()
+
+class LowestBinIndex:
+    # BIN auctions grouped by ExtraAttributes.id and by normalized name, every group is a list
+    # of (price, uuid) kept sorted so the cheapest auctions are always at the front
+    def __init__(self, auctions: t.Iterable[AuctionItem] = ()) -> None:
+        self.auctions: t.Dict[str, AuctionItem] = {}
+        self.by_id: t.Dict[str, t.List[t.Tuple[int, str]]] = {}
+        self.by_name: t.Dict[str, t.List[t.Tuple[int, str]]] = {}
+        self._keys: t.Dict[str, t.Tuple[t.Optional[str], str]] = {}
+        for auction in auctions:
+            self.add(auction)
+
+    def __len__(self) -> int:
+        return len(self.auctions)
+
+    def __contains__(self, uuid: str) -> bool:
+        return uuid in self.auctions
+
+    def __repr__(self) -> str:
+        return f"<LowestBinIndex auctions={len(self)}, ids={len(self.by_id)}>"
+
+    def add(self, auction: AuctionItem) -> None:
+        self.discard(auction.uuid)
+        if not auction.is_bin or not auction.is_alive:
+            return
+        try:
+            item_id = auction.id
+        except KeyError:
+            item_id = None
+        name = normalize_name(auction.name)
+        entry = (int(auction.starting_bid), auction.uuid)
+        if item_id is not None:
+            bisect.insort(self.by_id.setdefault(item_id, []), entry)
+        bisect.insort(self.by_name.setdefault(name, []), entry)
+        self.auctions[auction.uuid] = auction
+        self._keys[auction.uuid] = (item_id, name)
+
+    def discard(self, uuid: str) -> None:
+        auction = self.auctions.pop(uuid, None)
+        if auction is None:
+            return
+        item_id, name = self._keys.pop(uuid)
+        entry = (int(auction.starting_bid), uuid)
+        if item_id is not None:
+            self._remove_entry(self.by_id, item_id, entry)
+        self._remove_entry(self.by_name, name, entry)
+
+    @staticmethod
+    def _remove_entry(groups: t.Dict[str, t.List[t.Tuple[int, str]]], key: str, entry: t.Tuple[int, str]) -> None:
+        group = groups[key]
+        i = bisect.bisect_left(group, entry)
+        if i < len(group) and group[i] == entry:
+            del group[i]
+        if not group:
+            del groups[key]
+
+    def _group(self, key: str) -> t.List[t.Tuple[int, str]]:
+        group = self.by_id.get(key)
+        if group is None:
+            group = self.by_name.get(normalize_name(key), [])
+        return group
+
+    def cheapest(self, key: str, k: int = 1) -> t.List[AuctionItem]:
+        # key is an item id (HYPERION) or a display name (hyperion), auctions that expired since
+        # they were added are dropped on the way
+        return self._take(self._group(key), k)
+
+    def cheapest_matching(self, text: str, k: int = 1) -> t.List[AuctionItem]:
+        # every name containing text, what ApiClient.lowestbin_sort matches, cheapest first across all of them
+        text = normalize_name(text)
+        return self._take(heapq.merge(*[group for name, group in self.by_name.items() if text in name]), k)
+
+    def _take(self, entries: t.Iterable[t.Tuple[int, str]], k: int) -> t.List[AuctionItem]:
+        now = datetime.datetime.now()
+        result: t.List[AuctionItem] = []
+        expired: t.List[str] = []
+        for _, uuid in entries:
+            auction = self.auctions[uuid]
+            if auction.sold or auction.expires_at < now:
+                expired.append(uuid)
+                continue
+            result.append(auction)
+            if len(result) >= k:
+                break
+        for uuid in expired:
+            self.discard(uuid)
+        return result
+
+    def lowest(self, key: str) -> t.Optional[AuctionItem]:
+        result = self.cheapest(key, 1)
+        return result[0] if result else None
+
+    def lowest_matching(self, text: str) -> t.Optional[AuctionItem]:
+        result = self.cheapest_matching(text, 1)
+        return result[0] if result else None
+
+    def lowest_price(self, key: str) -> t.Optional[int]:
+        auction = self.lowest(key)
+        return auction.starting_bid if auction is not None else None
@@ -0,0 +1,159 @@
+import codecs
+import json
+import re
+import typing as t
+
+try:
+    import orjson
+except ImportError: # optional, fastest loads() backend
+    orjson = None
+
+try:
+    import msgspec
+except ImportError: # optional, typed auction page decoding
+    msgspec = None
+
+from .typings import xJsonT
+
+__all__ = [
+    "decode_auction_page",
+    "split_auction_page",
+    "AuctionStreamDecoder",
+    "iter_auction_entries",
+    "aiter_auction_entries",
+]
+
+BACKEND = "orjson" if orjson is not None else "msgspec" if msgspec is not None else "json"
+
+AUCTIONS_KEY = re.compile(r'"auctions"\s*:\s*\[')
+SEPARATORS = re.compile(r"[\s,]*")
+
+def loads(data: t.Union[bytes, str]) -> t.Any:
+    # json.loads with the fastest installed backend, same python objects whichever one runs
+    if orjson is not None:
+        return orjson.loads(data)
+    if msgspec is not None:
+        return msgspec.json.decode(data)
+    return json.loads(data)
+
+if msgspec is not None:
+    class _Entry(msgspec.Struct, kw_only=True):
+        # reads like the dict it replaces, so the client and LazyAuctionItem take either one.
+        # keys() is every field, the ones missing from the json hold their default
+        def __getitem__(self, key: str) -> t.Any:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+
+        def __contains__(self, key: str) -> bool:
+            return key in self.__struct_fields__
+
+        def keys(self) -> t.Tuple[str, ...]:
+            return self.__struct_fields__
+
+        def get(self, key: str, default: t.Any = None) -> t.Any:
+            return getattr(self, key, default)
+
+    class BidEntry(_Entry, kw_only=True):
+        auction_id: str
+        bidder: str
+        profile_id: str
+        amount: int
+        timestamp: int
+
+    class AuctionEntry(_Entry, kw_only=True):
+        # the /skyblock/auctions fields libsb reads, extra and the rest are skipped while decoding
+        uuid: str
+        auctioneer: str
+        profile_id: str
+        coop: t.List[str] = []
+        start: int
+        end: int
+        item_name: str
+        item_lore: str
+        category: t.Optional[str] = None
+        tier: t.Optional[str] = None
+        starting_bid: int
+        item_bytes: str
+        claimed: bool = False
+        highest_bid_amount: int = 0
+        bin: bool = False
+        bids: t.List[BidEntry] = []
+
+    class AuctionPage(msgspec.Struct):
+        success: bool
+        page: int = 0
+        totalPages: int = 0
+        totalAuctions: int = 0
+        lastUpdated: int = 0
+        auctions: t.List[AuctionEntry] = []
+
+    _page_decoder = msgspec.json.Decoder(AuctionPage)
+
+def decode_auction_page(content: t.Union[bytes, str]) -> t.List[xJsonT]:
+    # the auctions of a /skyblock/auctions body. with msgspec they come back as AuctionEntry
+    # structs, otherwise as dicts from loads()
+    return split_auction_page(content)[1]
+
+def split_auction_page(content: t.Union[bytes, str]) -> t.Tuple[xJsonT, t.List[xJsonT]]:
+    # decode_auction_page() that also hands back the top level keys (lastUpdated, totalPages, ...)
+    if msgspec is not None:
+        page = _page_decoder.decode(content)
+        return {x: getattr(page, x) for x in page.__struct_fields__ if x != "auctions"}, page.auctions
+    data = loads(content)
+    return data, data.pop("auctions")
+
+class AuctionStreamDecoder:
+    # incremental /skyblock/auctions parser: feed() body chunks as they arrive and get back every
+    # auction entry completed so far. the top level keys in front of the array end up in header
+    def __init__(self) -> None:
+        self.header: t.Optional[xJsonT] = None
+        self.done = False
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+
+    def feed(self, chunk: t.Union[bytes, str]) -> t.List[xJsonT]:
+        if self.done:
+            return []
+        self._buffer += self._text.decode(chunk) if isinstance(chunk, bytes) else chunk
+        if self.header is None:
+            # the key is searched again on every chunk until it shows up, bodies put it after a few scalars
+            match = AUCTIONS_KEY.search(self._buffer)
+            if match is None:
+                return []
+            self.header = json.loads(self._buffer[:match.start()].rstrip().rstrip(",") + "}")
+            self._buffer = self._buffer[match.end():]
+        entries, buffer, position = [], self._buffer, 0
+        while True:
+            position = SEPARATORS.match(buffer, position).end()
+            if position == len(buffer):
+                break
+            if buffer[position] == "]":
+                self.done = True
+                break
+            try:
+                entry, position = self._decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError: # the entry is still downloading
+                break
+            entries.append(entry)
+        self._buffer = buffer[position:]
+        return entries
+
+    def close(self) -> None:
+        if not self.done:
+            raise ValueError("auction page ended before its auctions array was closed")
+
+def iter_auction_entries(chunks: t.Iterable[t.Union[bytes, str]]) -> t.Iterator[xJsonT]:
+    decoder = AuctionStreamDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    decoder.close()
+
+async def aiter_auction_entries(chunks: t.AsyncIterable[t.Union[bytes, str]]) -> t.AsyncIterator[xJsonT]:
+    decoder = AuctionStreamDecoder()
+    async for chunk in chunks:
+        for entry in decoder.feed(chunk):
+            yield entry
+    decoder.close()
@@ -0,0 +1,109 @@
+import bisect
+import typing as t
+from dataclasses import dataclass
+
+try:
+    import numpy as np
+except ImportError: # optional, the batch functions return lists without it
+    np = None
+
+__all__ = [
+    "catacombs_levels",
+    "pet_level_from_exp",
+    "pet_levels",
+]
+
+Numbers = t.Union[t.Sequence[float], "np.ndarray"]
+
+CATACOMBS_LEVELS = {x: y + 1 for x, y in enumerate([50, 125, 235, 395, 625, 955, 1425, 2095, 3045, 4385, 6275, 8940, 12700, 17960, 25340, 35640, 50040, 70040, 97640, 135640, 188140, 259640, 356640, 488640, 668640, 911640, 1239640, 1684640, 2284640, 3084640, 4149640, 5559640, 7459640, 9959640, 13259640, 17559640, 23159640, 30359640, 39559640, 51559640, 66559640, 85559640, 109559640, 139559640, 177559640, 225559640, 285559640, 360559640, 453559640, 569809640])}
+CATACOMBS_THRESHOLDS = list(CATACOMBS_LEVELS.values()) # exp at which get_catacombs_level reports level i + 1
+CATACOMBS_OVERFLOW_START = 569_809_640
+CATACOMBS_OVERFLOW_EXP = 200_000_000 # per level past 50
+
+# cumulative exp over the shared pet curve, every rarity starts at its own offset into it. common
+# is listed from level 2 while the others start with their offset, the level 1 entry
+PET_LEVELS = {
+    "COMMON": [100, 210, 330, 460, 605, 765, 940, 1130, 1340, 1570, 1820, 2095, 2395, 2725, 3085, 3485, 3925, 4415, 4955, 5555, 6215, 6945, 7745, 8625, 9585, 10635, 11785, 13045, 14425, 15935, 17585, 19385, 21345, 23475, 25785, 28285, 30985, 33905, 37065, 40485, 44185, 48185, 52535, 57285, 62485, 68185, 74485, 81485, 89285, 97985, 107685, 118485, 130485, 143785, 158485, 174685, 192485, 211985, 233285, 256485, 281685, 309085, 338885, 371285, 406485, 444685, 486085, 530885, 579285, 631485, 687685, 748085, 812885, 882285, 956485, 1035685, 1120385, 1211085, 1308285, 1412485, 1524185, 1643885, 1772085, 1909285, 2055985, 2212685, 2380385, 2560085, 2752785, 2959485, 3181185, 3418885, 3673585, 3946285, 4237985, 4549685, 4883385, 5241085, 5624785, 6036485],
+    "UNCOMMON": [765, 940, 1130, 1340, 1570, 1820, 2095, 2395, 2725, 3085, 3485, 3925, 4415, 4955, 5555, 6215, 6945, 7745, 8625, 9585, 10635, 11785, 13045, 14425, 15935, 17585, 19385, 21345, 23475, 25785, 28285, 30985, 33905, 37065, 40485, 44185, 48185, 52535, 57285, 62485, 68185, 74485, 81485, 89285, 97985, 107685, 118485, 130485, 143785, 158485, 174685, 192485, 211985, 233285, 256485, 281685, 309085, 338885, 371285, 406485, 444685, 486085, 530885, 579285, 631485, 687685, 748085, 812885, 882285, 956485, 1035685, 1120385, 1211085, 1308285, 1412485, 1524185, 1643885, 1772085, 1909285, 2055985, 2212685, 2380385, 2560085, 2752785, 2959485, 3181185, 3418885, 3673585, 3946285, 4237985, 4549685, 4883385, 5241085, 5624785, 6036485, 6478185, 6954885, 7471585, 8033285, 8644985],
+    "RARE": [1820, 2095, 2395, 2725, 3085, 3485, 3925, 4415, 4955, 5555, 6215, 6945, 7745, 8625, 9585, 10635, 11785, 13045, 14425, 15935, 17585, 19385, 21345, 23475, 25785, 28285, 30985, 33905, 37065, 40485, 44185, 48185, 52535, 57285, 62485, 68185, 74485, 81485, 89285, 97985, 107685, 118485, 130485, 143785, 158485, 174685, 192485, 211985, 233285, 256485, 281685, 309085, 338885, 371285, 406485, 444685, 486085, 530885, 579285, 631485, 687685, 748085, 812885, 882285, 956485, 1035685, 1120385, 1211085, 1308285, 1412485, 1524185, 1643885, 1772085, 1909285, 2055985, 2212685, 2380385, 2560085, 2752785, 2959485, 3181185, 3418885, 3673585, 3946285, 4237985, 4549685, 4883385, 5241085, 5624785, 6036485, 6478185, 6954885, 7471585, 8033285, 8644985, 9311685, 10038385, 10830085, 11691785, 12628485],
+    "EPIC": [3485, 3925, 4415, 4955, 5555, 6215, 6945, 7745, 8625, 9585, 10635, 11785, 13045, 14425, 15935, 17585, 19385, 21345, 23475, 25785, 28285, 30985, 33905, 37065, 40485, 44185, 48185, 52535, 57285, 62485, 68185, 74485, 81485, 89285, 97985, 107685, 118485, 130485, 143785, 158485, 174685, 192485, 211985, 233285, 256485, 281685, 309085, 338885, 371285, 406485, 444685, 486085, 530885, 579285, 631485, 687685, 748085, 812885, 882285, 956485, 1035685, 1120385, 1211085, 1308285, 1412485, 1524185, 1643885, 1772085, 1909285, 2055985, 2212685, 2380385, 2560085, 2752785, 2959485, 3181185, 3418885, 3673585, 3946285, 4237985, 4549685, 4883385, 5241085, 5624785, 6036485, 6478185, 6954885, 7471585, 8033285, 8644985, 9311685, 10038385, 10830085, 11691785, 12628485, 13645185, 14746885, 15938585, 17225285, 18611985],
+    "LEGENDARY": [5555, 6215, 6945, 7745, 8625, 9585, 10635, 11785, 13045, 14425, 15935, 17585, 19385, 21345, 23475, 25785, 28285, 30985, 33905, 37065, 40485, 44185, 48185, 52535, 57285, 62485, 68185, 74485, 81485, 89285, 97985, 107685, 118485, 130485, 143785, 158485, 174685, 192485, 211985, 233285, 256485, 281685, 309085, 338885, 371285, 406485, 444685, 486085, 530885, 579285, 631485, 687685, 748085, 812885, 882285, 956485, 1035685, 1120385, 1211085, 1308285, 1412485, 1524185, 1643885, 1772085, 1909285, 2055985, 2212685, 2380385, 2560085, 2752785, 2959485, 3181185, 3418885, 3673585, 3946285, 4237985, 4549685, 4883385, 5241085, 5624785, 6036485, 6478185, 6954885, 7471585, 8033285, 8644985, 9311685, 10038385, 10830085, 11691785, 12628485, 13645185, 14746885, 15938585, 17225285, 18611985, 20108685, 21725385, 23472085, 25358785]
+}
+
+def _pet_thresholds(rarity: str, table: t.List[int]) -> t.List[int]:
+    # exp needed for levels 1..100
+    if rarity == "COMMON":
+        return [0, *table[:99]]
+    return [x - table[0] for x in table]
+
+PET_THRESHOLDS = {k: _pet_thresholds(k, v) for k, v in PET_LEVELS.items()}
+PET_THRESHOLDS["MYTHIC"] = PET_THRESHOLDS["LEGENDARY"]
+PET_MAX_LEVEL = 100
+
+@dataclass
+class CatacombsLevelInfo:
+    exp_from_new_level: float
+    exp_needed_for_new_level: float
+    percent_to_new_level: float
+    current_exp: float
+    current_level: int
+
+def get_catacombs_level(exp: float) -> CatacombsLevelInfo:
+    # percent_to_new_level is a fraction between levels 1 and 50 and a percentage below and above them
+    if exp < 51:
+        return CatacombsLevelInfo(exp, 50, exp*2, exp, 0)
+    level = bisect.bisect_right(CATACOMBS_THRESHOLDS, exp)
+    if level < len(CATACOMBS_THRESHOLDS):
+        needed = CATACOMBS_THRESHOLDS[level] - CATACOMBS_THRESHOLDS[level - 1]
+        new_exp = exp - CATACOMBS_THRESHOLDS[level - 1]
+        return CatacombsLevelInfo(round(new_exp, 1), needed, round(new_exp / needed, 2), round(exp, 1), level)
+    overflow, new_exp = divmod(exp - float(CATACOMBS_OVERFLOW_START), CATACOMBS_OVERFLOW_EXP)
+    return CatacombsLevelInfo(new_exp, CATACOMBS_OVERFLOW_EXP, round(new_exp/CATACOMBS_OVERFLOW_EXP*100, 2), exp, 50 + int(overflow))
+
+def catacombs_levels(exps: Numbers, fractional: bool = False) -> t.Union["np.ndarray", t.List[float]]:
+    # get_catacombs_level(x).current_level for every x, plus progress to the next level with fractional
+    if np is None:
+        result = []
+        for exp in exps:
+            info = get_catacombs_level(exp)
+            progress = info.exp_from_new_level / info.exp_needed_for_new_level
+            result.append(info.current_level + progress if fractional else info.current_level)
+        return result
+    exps = np.asarray(exps, dtype=np.float64)
+    thresholds = np.array(CATACOMBS_THRESHOLDS, dtype=np.float64)
+    levels = np.searchsorted(thresholds, exps, side="right")
+    overflow = levels == len(thresholds)
+    over_exp = np.maximum(exps - CATACOMBS_OVERFLOW_START, 0)
+    levels = np.where(overflow, 50 + over_exp // CATACOMBS_OVERFLOW_EXP, levels)
+    if not fractional:
+        return levels.astype(np.int64)
+    # level 0 spans 0..50, the overflow levels span 200M each
+    lower = np.concatenate(([0.0], thresholds[:-1]))
+    upper = np.concatenate(([50.0], thresholds[1:]))
+    index = np.minimum(levels, len(thresholds) - 1).astype(np.int64)
+    progress = np.where(
+        overflow,
+        (over_exp % CATACOMBS_OVERFLOW_EXP) / CATACOMBS_OVERFLOW_EXP,
+        (exps - lower[index]) / (upper[index] - lower[index]),
+    )
+    return levels + progress
+
+def pet_level_from_exp(exp: float, rarity: str) -> int:
+    # rarity as in petInfo.tier, exp as in petInfo.exp
+    return bisect.bisect_right(PET_THRESHOLDS[rarity], exp)
+
+def pet_levels(exps: Numbers, rarities: t.Union[str, t.Sequence[str]]) -> t.Union["np.ndarray", t.List[int]]:
+    # pet_level_from_exp over a whole batch, one searchsorted per rarity
+    if isinstance(rarities, str):
+        rarities = [rarities] * len(exps)
+    if np is None:
+        return [pet_level_from_exp(x, y) for x, y in zip(exps, rarities)]
+    exps = np.asarray(exps, dtype=np.float64)
+    rarities = np.asarray(rarities)
+    result = np.zeros(len(exps), dtype=np.int64)
+    for rarity in np.unique(rarities):
+        # KeyError on an unknown rarity, same as pet_level_from_exp
+        thresholds = PET_THRESHOLDS[str(rarity)]
+        mask = rarities == rarity
+        result[mask] = np.searchsorted(thresholds, exps[mask], side="right")
+    return result
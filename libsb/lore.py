@@ -0,0 +1,92 @@
+import typing as t
+from dataclasses import dataclass, field
+
+from . import utils
+from .typings import xJsonT
+
+__all__ = [
+    "LoreRun",
+    "LoreAnalysis",
+    "analyze_lore",
+]
+
+COLOR_CODES = frozenset("0123456789abcdef")
+
+class LoreRun(t.NamedTuple):
+    code: str # the character right after the §
+    color: str # color code in effect, f until the first one
+    text: str
+
+@dataclass(slots=True)
+class LoreAnalysis:
+    # everything the parsers and the renderer read out of a lore, each computed once on first access.
+    # plain python walks over the § segments measured slower than the C regex scans for cleaning and
+    # gemstones, so those stay regex and only the renderer works on segments
+    lore: str
+    _cache: t.Optional[t.Dict[str, t.Any]] = field(default=None, init=False, repr=False, compare=False)
+
+    @utils.cached_slot
+    def segments(self) -> t.List[str]:
+        # the code character followed by the text it applies to, the first one has no code
+        return self.lore.split("§")
+
+    @utils.cached_slot
+    def text(self) -> str:
+        return utils.clear_text(self.lore)
+
+    @utils.cached_slot
+    def lines(self) -> t.List[t.List[LoreRun]]:
+        # what the tooltip renderer draws, text in front of the first code of a line is not drawn
+        lines: t.List[t.List[LoreRun]] = [[] for _ in range(self.segments[0].count("\n") + 1)]
+        color = "f"
+        for segment in self.segments[1:]:
+            head, rest = segment, []
+            if "\n" in segment:
+                head, *rest = segment.split("\n")
+            if head:
+                if head[0] in COLOR_CODES:
+                    color = head[0]
+                if len(head) > 1:
+                    lines[-1].append(LoreRun(head[0], color, head[1:]))
+            lines.extend([] for _ in rest)
+        return lines
+
+    @utils.cached_slot
+    def item_data(self) -> xJsonT:
+        # utils.parse_item_data without splitting the whole lore into lines
+        lore = self.lore
+        last = lore[lore.rfind("\n") + 1:]
+        if not last or not last.isprintable(): # trailing newline or another line break character
+            lines = lore.splitlines()
+            last = lines[-1] if lines else ""
+        return utils.parse_item_type(utils.clear_text(last))
+
+    @utils.cached_slot
+    def gemstone_codes(self) -> t.List[t.Tuple[str, str]]:
+        # (bracket, gemstone) segments of every gemstone slot, ("6[", "b✎") for §6[§b✎§6]
+        if "[§" not in self.lore:
+            return []
+        return [tuple(x.split("§")[1:3]) for x in utils.GEMSTONE_PATTERN.findall(self.lore)]
+
+    @property
+    def rarity(self) -> t.Optional[str]:
+        return self.item_data["rarity"]
+
+    @property
+    def type(self) -> t.Optional[str]:
+        return self.item_data["type"]
+
+    @property
+    def is_recombed(self) -> bool:
+        return self.item_data["is_recombed"]
+
+    @property
+    def is_shiny(self) -> bool:
+        return self.item_data["is_shiny"]
+
+    @property
+    def is_dungeon(self) -> bool:
+        return self.item_data["is_dungeon"]
+
+def analyze_lore(lore: str) -> LoreAnalysis:
+    return LoreAnalysis(lore)
@@ -0,0 +1,126 @@
+import collections
+import hashlib
+import os
+import typing as t
+from pathlib import Path
+
+from PIL import Image
+
+from .writer import render
+
+class ImageCacheInfo(t.NamedTuple):
+    memory_hits: int
+    disk_hits: int
+    misses: int
+    memory_size: int
+    memory_bytes: int
+    disk_bytes: int
+
+class ImageCache:
+    # rendered tooltips keyed by a digest of the lore, an in-memory LRU in front of an optional
+    # directory of image files. cached images are shared so treat them as read-only. the memory tier
+    # is capped by entries and by decoded pixel bytes, a large tooltip alone is a megabyte or two
+    def __init__(
+        self,
+        maxsize: int = 256,
+        path: t.Union[str, Path, None] = None,
+        max_disk_bytes: int = 256 * 2 ** 20,
+        format: str = "png",
+        max_memory_bytes: int = 64 * 2 ** 20,
+    ) -> None:
+        self.maxsize = maxsize
+        self.max_memory_bytes = max_memory_bytes
+        self.path = Path(path) if path is not None else None
+        self.max_disk_bytes = max_disk_bytes
+        self.format = format.lower()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory: collections.OrderedDict[str, Image.Image] = collections.OrderedDict()
+        self._memory_bytes = 0
+        self._disk: collections.OrderedDict[Path, int] = collections.OrderedDict()
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            files = sorted(self.path.glob(f"*.{self.format}"), key=lambda x: x.stat().st_mtime)
+            for file in files:
+                self._disk[file] = file.stat().st_size
+
+    def __repr__(self) -> str:
+        return f"<ImageCache {self.info()}>"
+
+    @staticmethod
+    def key(lore: str) -> str:
+        return hashlib.blake2b(lore.encode(), digest_size=16).hexdigest()
+
+    def get(self, lore: str) -> Image.Image:
+        key = self.key(lore)
+        image = self._memory.get(key)
+        if image is not None:
+            self.memory_hits += 1
+            self._memory.move_to_end(key)
+            return image
+        image = self._load(key)
+        if image is not None:
+            self.disk_hits += 1
+        else:
+            self.misses += 1
+            image = render(lore)
+            self._store(key, image)
+        self._remember(key, image)
+        return image
+
+    @staticmethod
+    def _size(image: Image.Image) -> int:
+        return image.width * image.height * len(image.getbands())
+
+    def _remember(self, key: str, image: Image.Image) -> None:
+        if key in self._memory:
+            self._memory_bytes -= self._size(self._memory[key])
+        self._memory[key] = image
+        self._memory_bytes += self._size(image)
+        while len(self._memory) > self.maxsize or (self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1):
+            self._memory_bytes -= self._size(self._memory.popitem(last=False)[1])
+
+    def _file(self, key: str) -> t.Optional[Path]:
+        return self.path.joinpath(f"{key}.{self.format}") if self.path is not None else None
+
+    def _load(self, key: str) -> t.Optional[Image.Image]:
+        file = self._file(key)
+        if file is None or file not in self._disk:
+            return None
+        try:
+            with Image.open(file) as image:
+                image.load()
+        except OSError: # removed or truncated behind our back
+            self._disk.pop(file, None)
+            return None
+        os.utime(file)
+        self._disk.move_to_end(file)
+        return image
+
+    def _store(self, key: str, image: Image.Image) -> None:
+        file = self._file(key)
+        if file is None:
+            return
+        image.save(file, format=self.format, **({"lossless": True} if self.format == "webp" else {}))
+        self._disk[file] = file.stat().st_size
+        total = sum(self._disk.values())
+        while total > self.max_disk_bytes and len(self._disk) > 1:
+            oldest, size = self._disk.popitem(last=False)
+            oldest.unlink(missing_ok=True)
+            total -= size
+
+    def info(self) -> ImageCacheInfo:
+        return ImageCacheInfo(self.memory_hits, self.disk_hits, self.misses, len(self._memory), self._memory_bytes, sum(self._disk.values()))
+
+    def clear(self, disk: bool = False) -> None:
+        self._memory.clear()
+        self._memory_bytes = 0
+        self.memory_hits = self.disk_hits = self.misses = 0
+        if disk:
+            for file in self._disk:
+                file.unlink(missing_ok=True)
+            self._disk.clear()
+
+# swap for ImageCache(path=...) to keep tooltips across restarts
+IMAGE_CACHE = ImageCache()
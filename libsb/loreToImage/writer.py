@@ -1,7 +1,17 @@
+import functools
+import time
+import typing as t
+from concurrent.futures import Executor
 from pathlib import Path
 
 from PIL import Image, ImageColor, ImageDraw, ImageFont
 
+from ..lore import analyze_lore
+
+PATH = Path(__file__).parent
+MARGIN_X = 15
+MARGIN_Y = 10
+LINE_HEIGHT = 24
 COLORS = {
     "0": "#000000",
     "1": "#0000AA",
@@ -20,60 +30,154 @@ COLORS = {
     "e": "#FFFF55",
     "f": "#FFFFFF",
 }
+RGBA_COLORS = {k: ImageColor.getcolor(v, "RGBA") for k, v in COLORS.items()}
+
+@functools.lru_cache(maxsize=None)
+def load_font(name: str, size: int = 22) -> ImageFont.FreeTypeFont:
+    # fonts are loaded once per process and shared by every writer
+    return ImageFont.truetype(str(PATH.joinpath("fonts", f"{name}.otf")), size=size, encoding="", layout_engine=ImageFont.Layout.BASIC)
+
+@functools.lru_cache(maxsize=None)
+def advance(font: ImageFont.FreeTypeFont, char: str) -> float:
+    # the bundled fonts have no kerning, so a run is exactly as wide as the sum of its glyphs
+    return font.getlength(char)
+
+class Glyph(t.NamedTuple):
+    mask: Image.Image
+    dx: int
+    dy: int
+
+class AtlasInfo(t.NamedTuple):
+    hits: int
+    misses: int
+    glyphs: int
+    images: int
+    render_time: float
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / (self.hits + self.misses) if self.hits + self.misses else 0.0
+
+    @property
+    def mean_render_time(self) -> float:
+        return self.render_time / self.images if self.images else 0.0
+
+class GlyphAtlas:
+    # every (font, char) is rasterized by FreeType once into an alpha mask, drawing is then just
+    # Image.paste of a palette color through that mask
+    def __init__(self) -> None:
+        self.glyphs: t.Dict[t.Tuple[ImageFont.FreeTypeFont, str], Glyph] = {}
+        self.hits = 0
+        self.misses = 0
+        self.images = 0
+        self.render_time = 0.0
+
+    def __repr__(self) -> str:
+        return f"<GlyphAtlas {self.info()}>"
+
+    def get(self, font: ImageFont.FreeTypeFont, char: str) -> Glyph:
+        glyph = self.glyphs.get((font, char))
+        if glyph is not None:
+            self.hits += 1
+            return glyph
+        self.misses += 1
+        left, top, right, bottom = font.getbbox(char)
+        mask = Image.new("L", (max(right - left, 0), max(bottom - top, 0)))
+        ImageDraw.Draw(mask).text((-left, -top), char, font=font, fill=255)
+        glyph = self.glyphs[(font, char)] = Glyph(mask, left, top)
+        return glyph
+
+    def info(self) -> AtlasInfo:
+        return AtlasInfo(self.hits, self.misses, len(self.glyphs), self.images, self.render_time)
+
+    def clear(self) -> None:
+        self.glyphs.clear()
+        self.hits = self.misses = self.images = 0
+        self.render_time = 0.0
+
+ATLAS = GlyphAtlas()
+
+class Run(t.NamedTuple):
+    x: float
+    text: str
+    font: ImageFont.FreeTypeFont
+    color: t.Tuple[int, ...]
+
 class LoreWriter:
     def __init__(self, lore: str) -> None:
-        self.path = Path(__file__).parent
-        self.x = 15
-        self.y = 10
-        self.width = 590
+        self.path = PATH
+        self.x = MARGIN_X
+        self.y = MARGIN_Y
+        self.analysis = analyze_lore(lore)
         self.lines = lore.split("\n")
         self.height = (25 * len(self.lines)) + 15
         self.initialize_fonts()
+        self.runs = self.layout()
+        self.width = int(max((run.x + self.measure(run) for line in self.runs for run in line[-1:]), default=0)) + MARGIN_X
         self.image = None
-    
-    def draw_text(self, *args, **kwargs) -> None:
-        self.draw.text(*args, **kwargs)
-    
+
+    def layout(self) -> t.List[t.List[Run]]:
+        # splits every line into runs of text sharing font and color, x positions come from the real glyph advances
+        result = []
+        for line in self.analysis.lines:
+            x, runs = float(MARGIN_X), []
+            for code, color_code, text in line:
+                bold = code == "l"
+                color = RGBA_COLORS[color_code]
+                start = 0
+                while start < len(text):
+                    ascii = text[start].isascii()
+                    end = start + 1
+                    while end < len(text) and text[end].isascii() is ascii:
+                        end += 1
+                    font = (self.bold if bold else self.ascii_regular) if ascii else self.uni_regular
+                    run = Run(x, text[start:end], font, color)
+                    runs.append(run)
+                    x += self.measure(run)
+                    start = end
+            result.append(runs)
+        return result
+
+    @staticmethod
+    def measure(run: Run) -> float:
+        return sum(advance(run.font, char) for char in run.text)
+
+    def draw_run(self, image: Image.Image, run: Run, y: int) -> None:
+        # glyph by glyph from the atlas, FreeType gets slower per glyph on longer strings with these fonts
+        x = run.x
+        for char in run.text:
+            glyph = ATLAS.get(run.font, char)
+            if glyph.mask.width and glyph.mask.height:
+                image.paste(run.color, (int(x) + glyph.dx, y + glyph.dy), glyph.mask)
+            x += advance(run.font, char)
+
     def get_image(self) -> Image.Image:
         if self.image is None:
-            bold = False
+            start = time.perf_counter()
             image = Image.new("RGBA", (self.width, self.height), color="black")
-            self.draw = ImageDraw.Draw(image, "RGBA")
-            for x in self.lines:
-                for y in x.split("§")[1:]:
-                    if y[0] == "l":
-                        bold = True
-                    if y[0] in COLORS.keys():
-                        color = ImageColor.getcolor(COLORS[y[0]], "RGBA")
-                    for z in y[1:]:
-                        if z.isascii():
-                            if not bold:
-                                self.draw_text(xy=(self.x, self.y), text=z, font=self.ascii_regular, fill=color) # type: ignore
-                            else:
-                                self.draw_text(xy=(self.x-5, self.y), text=z, font=self.bold, fill=color) # type: ignore
-                            if z in ["i", "l", ",", ".", ":", "[", "]", " ", "'"]:
-                                self.x += 7
-                            elif z in "tI":
-                                self.x += 9
-                            else:
-                                self.x += 14
-                        else:
-                            self.draw_text(xy=(self.x, self.y), text=z, font=self.uni_regular, fill=color) # type: ignore
-                            self.x += 16
-                    self.x += 3
-                    bold = False
-                self.y += 24
-                self.x = 15
+            for i, line in enumerate(self.runs):
+                for run in line:
+                    self.draw_run(image, run, self.y + i * LINE_HEIGHT)
             self.image = image
+            ATLAS.images += 1
+            ATLAS.render_time += time.perf_counter() - start
         return self.image
     
     def initialize_fonts(self) -> None:
-        size, encoding = 22, ""
-        self.ascii_regular = ImageFont.truetype(self.path.joinpath("fonts", "regular.otf").open("rb"), size=size, encoding=encoding)
-        self.uni_regular = ImageFont.truetype(self.path.joinpath("fonts", "minecraft-unicode.otf").open("rb"), size=16, encoding=encoding)
-        self.bold = ImageFont.truetype(self.path.joinpath("fonts", "bold.otf").open("rb"), size=size, encoding=encoding)
-        self.italic = ImageFont.truetype(self.path.joinpath("fonts", "italic.otf").open("rb"), size=size, encoding=encoding)
-        self.bolditalic = ImageFont.truetype(self.path.joinpath("fonts", "bolditalic.otf").open("rb"), size=size, encoding=encoding)
+        self.ascii_regular = load_font("regular")
+        self.uni_regular = load_font("minecraft-unicode", 16)
+        self.bold = load_font("bold")
+        self.italic = load_font("italic")
+        self.bolditalic = load_font("bolditalic")
+
+def render(lore: str) -> Image.Image:
+    return LoreWriter(lore).get_image()
+
+def render_many(lores: t.Iterable[str], executor: t.Optional[Executor] = None, chunksize: int = 16) -> t.List[Image.Image]:
+    # with a process pool every worker loads the fonts once and then renders its share of the lores
+    if executor is None:
+        return [render(lore) for lore in lores]
+    return list(executor.map(render, lores, chunksize=chunksize))
 
 if __name__ == "__main__":
     lore = u"""
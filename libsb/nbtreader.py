@@ -0,0 +1,95 @@
+import struct
+import typing as t
+import zlib
+
+from .typings import xJsonT
+
+__all__ = [
+    "loads",
+]
+
+# single pass NBT -> dict/list reader, output matches the old nbt.NBTFile walk in utils:
+# compounds become dicts, lists become lists, "Lore" lists are joined with newlines and
+# byte arrays inside compounds are decoded as nested (gzip'd) NBT
+
+TAG_END = 0
+TAG_BYTE_ARRAY = 7
+TAG_STRING = 8
+TAG_LIST = 9
+TAG_COMPOUND = 10
+TAG_INT_ARRAY = 11
+TAG_LONG_ARRAY = 12
+
+_USHORT = struct.Struct(">H")
+_INT = struct.Struct(">i")
+_SCALARS = {
+    1: struct.Struct(">b"),
+    2: struct.Struct(">h"),
+    3: _INT,
+    4: struct.Struct(">q"),
+    5: struct.Struct(">f"),
+    6: struct.Struct(">d"),
+}
+_CODES = {k: v.format[1:] for k, v in _SCALARS.items()}
+_ARRAY_CODES = {TAG_INT_ARRAY: "i", TAG_LONG_ARRAY: "q"}
+
+def loads(data: t.Union[bytes, bytearray, memoryview]) -> xJsonT:
+    if data[:2] == b"\x1f\x8b":
+        data = zlib.decompress(data, 31)
+    buf = memoryview(data)
+    if not buf or buf[0] != TAG_COMPOUND:
+        raise ValueError("NBT data must start with a compound tag")
+    pos = 3 + _USHORT.unpack_from(buf, 1)[0] # root name is dropped
+    return _read_compound(buf, pos)[0]
+
+def _read_compound(buf: memoryview, pos: int) -> t.Tuple[xJsonT, int]:
+    result: xJsonT = {}
+    while True:
+        tag = buf[pos]
+        if tag == TAG_END:
+            return result, pos + 1
+        size = _USHORT.unpack_from(buf, pos + 1)[0]
+        pos += 3
+        name = str(buf[pos:pos + size], "utf-8")
+        pos += size
+        if tag == TAG_BYTE_ARRAY:
+            size = _INT.unpack_from(buf, pos)[0]
+            pos += 4
+            value = loads(buf[pos:pos + size])
+            pos += size
+        else:
+            value, pos = _read_payload(buf, pos, tag)
+            if tag == TAG_LIST and name.lower() == "lore":
+                value = "\n".join(value)
+        result[name] = value
+
+def _read_payload(buf: memoryview, pos: int, tag: int) -> t.Tuple[t.Any, int]:
+    if tag == TAG_STRING:
+        size = _USHORT.unpack_from(buf, pos)[0]
+        pos += 2
+        return str(buf[pos:pos + size], "utf-8"), pos + size
+    if tag == TAG_COMPOUND:
+        return _read_compound(buf, pos)
+    if tag == TAG_LIST:
+        item, size = buf[pos], _INT.unpack_from(buf, pos + 1)[0]
+        pos += 5
+        if item in _CODES:
+            fmt = struct.Struct(f">{size}{_CODES[item]}")
+            return list(fmt.unpack_from(buf, pos)), pos + fmt.size
+        items = []
+        for _ in range(size):
+            value, pos = _read_payload(buf, pos, item)
+            items.append(value)
+        return items, pos
+    if tag in _SCALARS:
+        fmt = _SCALARS[tag]
+        return fmt.unpack_from(buf, pos)[0], pos + fmt.size
+    if tag == TAG_BYTE_ARRAY:
+        size = _INT.unpack_from(buf, pos)[0]
+        pos += 4
+        return bytearray(buf[pos:pos + size]), pos + size
+    if tag in _ARRAY_CODES:
+        size = _INT.unpack_from(buf, pos)[0]
+        fmt = struct.Struct(f">{size}{_ARRAY_CODES[tag]}")
+        return list(fmt.unpack_from(buf, pos + 4)), pos + 4 + fmt.size
+    raise ValueError(f"Unknown NBT tag type {tag} at offset {pos}")
@@ -0,0 +1,107 @@
+import asyncio
+import datetime
+import functools
+import typing as t
+from concurrent.futures import Executor
+
+from curl_cffi.requests.models import Response
+
+from .client import ApiClient, _auction_page, _decode_auctions
+from .containers import *
+from .index import LowestBinIndex
+from .typings import xJsonT
+
+__all__ = [
+    "AuctionSnapshot",
+]
+
+class AuctionSnapshot:
+    def __init__(self, client: ApiClient, max_in_flight: t.Optional[int] = 8, executor: t.Optional[Executor] = None, lazy: bool = False, index_bins: t.Optional[bool] = None, compact: bool = False) -> None:
+        self.client = client
+        self.max_in_flight = max_in_flight
+        self.executor = executor
+        self.lazy = lazy
+        self.compact = compact
+        self.auctions: t.Dict[str, AuctionItem] = {}
+        # the index reads every BIN auction's item id out of its NBT, so with lazy decoding it is off
+        # unless asked for
+        self.lowest_bins = LowestBinIndex() if (not lazy if index_bins is None else index_bins) else None
+        self.last_updated: int = 0
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self.auctions)
+
+    def __iter__(self) -> t.Iterator[AuctionItem]:
+        return iter(self.auctions.values())
+
+    def __contains__(self, uuid: str) -> bool:
+        return uuid in self.auctions
+
+    def __getitem__(self, uuid: str) -> AuctionItem:
+        return self.auctions[uuid]
+
+    def __repr__(self) -> str:
+        return f"<AuctionSnapshot auctions={len(self)}, lastUpdated={self.updated_at}>"
+
+    @property
+    def updated_at(self) -> t.Optional[datetime.datetime]:
+        return datetime.datetime.fromtimestamp(self.last_updated / 1000) if self.last_updated else None
+
+    def get(self, uuid: str) -> t.Optional[AuctionItem]:
+        return self.auctions.get(uuid)
+
+    def _add(self, auction: AuctionItem) -> None:
+        self.auctions[auction.uuid] = auction
+        if self.lowest_bins is not None:
+            self.lowest_bins.add(auction)
+        if self.compact: # eager auctions come compacted from the decoder, lazy ones may have been parsed by the bin index
+            auction.compact()
+
+    def _remove(self, uuid: str) -> t.Optional[AuctionItem]:
+        if self.lowest_bins is not None:
+            self.lowest_bins.discard(uuid)
+        return self.auctions.pop(uuid, None)
+
+    def _is_stale(self, x: xJsonT) -> bool:
+        # bids are the only thing that changes on a listed auction
+        known = self.auctions.get(x["uuid"])
+        return known is None or known.highest_bid != x["highest_bid_amount"]
+
+    async def refresh(self) -> bool:
+        async with self._lock:
+            for uuid in await self.client.ended_auction_ids():
+                self._remove(uuid)
+            now = datetime.datetime.now()
+            for auction in self.auctions.values():
+                auction.expired = now > auction.expires_at
+            fast = self.client.fast_json
+            first = await self.client.api_request("/skyblock/auctions", page=0)
+            page_0, entries_0 = _auction_page(first.content, fast)
+            if page_0["lastUpdated"] == self.last_updated:
+                return False
+            executor = self.executor or self.client.decode_executor
+            decoder = functools.partial(_decode_auctions, lazy=self.lazy, compact=self.compact)
+            consistent = True
+            async def handler(resp: Response) -> t.Tuple[t.List[str], t.List[AuctionItem]]:
+                nonlocal consistent
+                header, entries = (page_0, entries_0) if resp is first else _auction_page(resp.content, fast)
+                if header["lastUpdated"] != page_0["lastUpdated"]:
+                    consistent = False
+                stale = [x for x in entries if self._is_stale(x)]
+                return [x["uuid"] for x in entries], await self.client._run_decoder(executor, decoder, stale)
+            seen: t.Set[str] = set()
+            pages = 0
+            async for uuids, decoded in self.client._iter_auction_pages(handler, self.max_in_flight, first, page_0["totalPages"]):
+                seen.update(uuids)
+                for auction in decoded:
+                    self._add(auction)
+                pages += 1
+            if pages == page_0["totalPages"] and consistent:
+                # only prune when every page came through from the same update. a failed page would look
+                # like a mass sell-out, and after an update mid-scan auctions can have moved onto pages
+                # that were already fetched
+                for uuid in self.auctions.keys() - seen:
+                    self._remove(uuid)
+            self.last_updated = page_0["lastUpdated"]
+            return True
@@ -0,0 +1,134 @@
+import datetime
+import typing as t
+
+try:
+    import numpy as np
+except ImportError: # optional, only needed for AuctionTable
+    np = None
+
+from .containers import *
+from .enums import *
+
+__all__ = [
+    "AuctionTable",
+]
+
+RARITIES = list(ItemRarity)
+RARITY_CODES = {x: i for i, x in enumerate(RARITIES)}
+
+def _millis(date: datetime.datetime) -> int:
+    return int(date.timestamp() * 1000)
+
+def _item_id(auction: AuctionItem) -> str:
+    try:
+        return auction.id
+    except KeyError:
+        return ""
+
+class AuctionTable:
+    # columnar view of a snapshot, row i of every column belongs to self.auctions[i]
+    def __init__(self, auctions: t.Iterable[AuctionItem]) -> None:
+        if np is None:
+            raise ImportError("AuctionTable requires numpy")
+        self.auctions = list(auctions)
+        self.item_ids: t.List[str] = []
+        self.names: t.List[str] = []
+        item_codes: t.Dict[str, int] = {}
+        name_codes: t.Dict[str, int] = {}
+        def encode(value: str, codes: t.Dict[str, int], values: t.List[str]) -> int:
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(values)
+                values.append(value)
+            return code
+        n = len(self.auctions)
+        self.price = np.empty(n, dtype=np.int64)
+        self.highest_bid = np.empty(n, dtype=np.int64)
+        self.start = np.empty(n, dtype=np.int64)
+        self.end = np.empty(n, dtype=np.int64)
+        self.is_bin = np.empty(n, dtype=np.bool_)
+        self.sold = np.empty(n, dtype=np.bool_)
+        self.rarity = np.empty(n, dtype=np.int8)
+        self.item_id = np.empty(n, dtype=np.int32)
+        self.name = np.empty(n, dtype=np.int32)
+        for i, x in enumerate(self.auctions):
+            self.price[i] = x.starting_bid
+            self.highest_bid[i] = x.highest_bid
+            self.start[i] = _millis(x.started)
+            self.end[i] = _millis(x.expires_at)
+            self.is_bin[i] = x.is_bin
+            self.sold[i] = x.sold
+            self.rarity[i] = RARITY_CODES[x.rarity]
+            self.item_id[i] = encode(_item_id(x), item_codes, self.item_ids)
+            self.name[i] = encode(x.name, name_codes, self.names)
+        self._item_codes = item_codes
+        self._name_codes = name_codes
+
+    def __len__(self) -> int:
+        return len(self.auctions)
+
+    def __repr__(self) -> str:
+        return f"<AuctionTable rows={len(self)}, items={len(self.item_ids)}>"
+
+    @classmethod
+    def from_snapshot(cls, snapshot: t.Iterable[AuctionItem]) -> "AuctionTable":
+        return cls(snapshot)
+
+    def alive(self, now: t.Optional[datetime.datetime] = None) -> "np.ndarray":
+        return ~self.sold & (self.end > _millis(now or datetime.datetime.now()))
+
+    def mask(
+        self,
+        item_id: t.Optional[str] = None,
+        name: t.Optional[str] = None,
+        rarity: t.Union[ItemRarity, t.Iterable[ItemRarity], None] = None,
+        is_bin: t.Optional[bool] = None,
+        alive: t.Optional[bool] = None,
+        min_price: t.Optional[int] = None,
+        max_price: t.Optional[int] = None,
+    ) -> "np.ndarray":
+        result = np.ones(len(self), dtype=np.bool_)
+        if item_id is not None:
+            result &= self.item_id == self._item_codes.get(item_id, -1)
+        if name is not None:
+            result &= self.name == self._name_codes.get(name, -1)
+        if rarity is not None:
+            rarities = [rarity] if isinstance(rarity, ItemRarity) else rarity
+            result &= np.isin(self.rarity, [RARITY_CODES[x] for x in rarities])
+        if is_bin is not None:
+            result &= self.is_bin == is_bin
+        if alive is not None:
+            result &= self.alive() == alive
+        if min_price is not None:
+            result &= self.price >= min_price
+        if max_price is not None:
+            result &= self.price <= max_price
+        return result
+
+    def rows(self, mask: "np.ndarray") -> t.List[AuctionItem]:
+        return [self.auctions[i] for i in np.flatnonzero(mask)]
+
+    def sorted_rows(self, mask: "np.ndarray", limit: t.Optional[int] = None) -> t.List[AuctionItem]:
+        idx = np.flatnonzero(mask)
+        idx = idx[np.argsort(self.price[idx], kind="stable")][:limit]
+        return [self.auctions[i] for i in idx]
+
+    def lowest_bin(self, item_id: str) -> t.Optional[AuctionItem]:
+        rows = self.sorted_rows(self.mask(item_id=item_id, is_bin=True, alive=True), 1)
+        return rows[0] if rows else None
+
+    def lowest_bins(self, **filters: t.Any) -> t.Dict[str, AuctionItem]:
+        # cheapest alive BIN for every item id in one lexsort
+        idx = np.flatnonzero(self.mask(is_bin=True, alive=True, **filters))
+        idx = idx[np.lexsort((self.price[idx], self.item_id[idx]))]
+        codes, first = np.unique(self.item_id[idx], return_index=True)
+        return {self.item_ids[code]: self.auctions[idx[i]] for code, i in zip(codes, first) if self.item_ids[code]}
+
+    def percentile(self, q: t.Union[float, t.Sequence[float]], **filters: t.Any) -> t.Union[float, "np.ndarray", None]:
+        prices = self.price[self.mask(**filters)]
+        if not prices.size:
+            return None
+        return np.percentile(prices, q)
+
+    def median(self, **filters: t.Any) -> t.Optional[float]:
+        return self.percentile(50, **filters)
@@ -1,14 +1,21 @@
+import asyncio
 import base64
+import collections
 import datetime
-import io
+import functools
+import hashlib
+import inspect
 import re
+import sys
+import threading
 import typing as t
-from dataclasses import dataclass
-import nbt.nbt as nbt
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 
 T = t.TypeVar("T")
 P = t.ParamSpec("P")
 
+from . import nbtreader
+from .levels import CATACOMBS_LEVELS, PET_LEVELS, CatacombsLevelInfo, get_catacombs_level
 from .enums import *
 from .errors import *
 from .typings import *
@@ -18,31 +25,124 @@ COLOR_PATTERN = re.compile(r"§[0-9A-fklmnorKLMNOR]")
 ITEM_TYPE_PATTERN = re.compile(r"(?P<is_recombed>a )?(?P<is_shiny>SHINY )?(?P<rarity>\S+)?(?P<is_dungeon> DUNGEON)?(?P<type>.+[^ a-])?")
 PET_LEVEL_REGEX = re.compile(r"\[Lvl (\d+)\] .+")
 
-CATACOMBS_LEVELS = {x: y + 1 for x, y in enumerate([50, 125, 235, 395, 625, 955, 1425, 2095, 3045, 4385, 6275, 8940, 12700, 17960, 25340, 35640, 50040, 70040, 97640, 135640, 188140, 259640, 356640, 488640, 668640, 911640, 1239640, 1684640, 2284640, 3084640, 4149640, 5559640, 7459640, 9959640, 13259640, 17559640, 23159640, 30359640, 39559640, 51559640, 66559640, 85559640, 109559640, 139559640, 177559640, 225559640, 285559640, 360559640, 453559640, 569809640])}
-
-PET_LEVELS = {
-    "COMMON": [100, 210, 330, 460, 605, 765, 940, 1130, 1340, 1570, 1820, 2095, 2395, 2725, 3085, 3485, 3925, 4415, 4955, 5555, 6215, 6945, 7745, 8625, 9585, 10635, 11785, 13045, 14425, 15935, 17585, 19385, 21345, 23475, 25785, 28285, 30985, 33905, 37065, 40485, 44185, 48185, 52535, 57285, 62485, 68185, 74485, 81485, 89285, 97985, 107685, 118485, 130485, 143785, 158485, 174685, 192485, 211985, 233285, 256485, 281685, 309085, 338885, 371285, 406485, 444685, 486085, 530885, 579285, 631485, 687685, 748085, 812885, 882285, 956485, 1035685, 1120385, 1211085, 1308285, 1412485, 1524185, 1643885, 1772085, 1909285, 2055985, 2212685, 2380385, 2560085, 2752785, 2959485, 3181185, 3418885, 3673585, 3946285, 4237985, 4549685, 4883385, 5241085, 5624785, 6036485],
-    "UNCOMMON": [765, 940, 1130, 1340, 1570, 1820, 2095, 2395, 2725, 3085, 3485, 3925, 4415, 4955, 5555, 6215, 6945, 7745, 8625, 9585, 10635, 11785, 13045, 14425, 15935, 17585, 19385, 21345, 23475, 25785, 28285, 30985, 33905, 37065, 40485, 44185, 48185, 52535, 57285, 62485, 68185, 74485, 81485, 89285, 97985, 107685, 118485, 130485, 143785, 158485, 174685, 192485, 211985, 233285, 256485, 281685, 309085, 338885, 371285, 406485, 444685, 486085, 530885, 579285, 631485, 687685, 748085, 812885, 882285, 956485, 1035685, 1120385, 1211085, 1308285, 1412485, 1524185, 1643885, 1772085, 1909285, 2055985, 2212685, 2380385, 2560085, 2752785, 2959485, 3181185, 3418885, 3673585, 3946285, 4237985, 4549685, 4883385, 5241085, 5624785, 6036485, 6478185, 6954885, 7471585, 8033285, 8644985],
-    "RARE": [1820, 2095, 2395, 2725, 3085, 3485, 3925, 4415, 4955, 5555, 6215, 6945, 7745, 8625, 9585, 10635, 11785, 13045, 14425, 15935, 17585, 19385, 21345, 23475, 25785, 28285, 30985, 33905, 37065, 40485, 44185, 48185, 52535, 57285, 62485, 68185, 74485, 81485, 89285, 97985, 107685, 118485, 130485, 143785, 158485, 174685, 192485, 211985, 233285, 256485, 281685, 309085, 338885, 371285, 406485, 444685, 486085, 530885, 579285, 631485, 687685, 748085, 812885, 882285, 956485, 1035685, 1120385, 1211085, 1308285, 1412485, 1524185, 1643885, 1772085, 1909285, 2055985, 2212685, 2380385, 2560085, 2752785, 2959485, 3181185, 3418885, 3673585, 3946285, 4237985, 4549685, 4883385, 5241085, 5624785, 6036485, 6478185, 6954885, 7471585, 8033285, 8644985, 9311685, 10038385, 10830085, 11691785, 12628485],
-    "EPIC": [3485, 3925, 4415, 4955, 5555, 6215, 6945, 7745, 8625, 9585, 10635, 11785, 13045, 14425, 15935, 17585, 19385, 21345, 23475, 25785, 28285, 30985, 33905, 37065, 40485, 44185, 48185, 52535, 57285, 62485, 68185, 74485, 81485, 89285, 97985, 107685, 118485, 130485, 143785, 158485, 174685, 192485, 211985, 233285, 256485, 281685, 309085, 338885, 371285, 406485, 444685, 486085, 530885, 579285, 631485, 687685, 748085, 812885, 882285, 956485, 1035685, 1120385, 1211085, 1308285, 1412485, 1524185, 1643885, 1772085, 1909285, 2055985, 2212685, 2380385, 2560085, 2752785, 2959485, 3181185, 3418885, 3673585, 3946285, 4237985, 4549685, 4883385, 5241085, 5624785, 6036485, 6478185, 6954885, 7471585, 8033285, 8644985, 9311685, 10038385, 10830085, 11691785, 12628485, 13645185, 14746885, 15938585, 17225285, 18611985],
-    "LEGENDARY": [5555, 6215, 6945, 7745, 8625, 9585, 10635, 11785, 13045, 14425, 15935, 17585, 19385, 21345, 23475, 25785, 28285, 30985, 33905, 37065, 40485, 44185, 48185, 52535, 57285, 62485, 68185, 74485, 81485, 89285, 97985, 107685, 118485, 130485, 143785, 158485, 174685, 192485, 211985, 233285, 256485, 281685, 309085, 338885, 371285, 406485, 444685, 486085, 530885, 579285, 631485, 687685, 748085, 812885, 882285, 956485, 1035685, 1120385, 1211085, 1308285, 1412485, 1524185, 1643885, 1772085, 1909285, 2055985, 2212685, 2380385, 2380385, 2380385, 2380385, 2380385, 3418885, 3673585, 3946285, 4237985, 4549685, 4883385, 5241085, 5624785, 6036485, 6478185, 6954885, 7471585, 8033285, 8644985, 9311685, 10038385, 10830085, 11691785, 12628485, 13645185, 14746885, 15938585, 17225285, 18611985, 20108685, 21725385, 23472085, 25358785]
-}
 class CuteInt(int):
     def __repr__(self) -> str:
         return f"{self:,}"
     
     __str__ = __repr__
 
+class cached_slot(t.Generic[T]):
+    # cached_property for slotted classes, values are kept in the instance's `_cache` slot
+    # which stays None until something is actually cached
+    def __init__(self, func: t.Callable[[t.Any], T]) -> None:
+        self.func = func
+        self.name = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    @t.overload
+    def __get__(self, instance: None, owner: t.Optional[type] = None) -> "cached_slot[T]": ...
+    @t.overload
+    def __get__(self, instance: t.Any, owner: t.Optional[type] = None) -> T: ...
+    def __get__(self, instance: t.Any, owner: t.Optional[type] = None) -> t.Any:
+        if instance is None:
+            return self
+        cache = instance._cache
+        if cache is None:
+            cache = instance._cache = {}
+        if self.name not in cache:
+            cache[self.name] = self.func(instance)
+        return cache[self.name]
+
+class DecodeCacheInfo(t.NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+class DecodeCache:
+    # decoded NBT keyed by a digest of the base64 blob, results are shared so treat them as read-only.
+    # thread pool decoders share it, so the dict is only touched under the lock
+    def __init__(self, maxsize: int = 2 ** 16, enabled: bool = True) -> None:
+        self.maxsize = maxsize
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._data: collections.OrderedDict[bytes, xJsonT] = collections.OrderedDict()
+        self._keys: t.Dict[int, bytes] = {} # id of every cached root and of the items in it, see discard()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"<DecodeCache {self.info()}>"
+
+    @staticmethod
+    def key(raw: str) -> bytes:
+        return hashlib.blake2b(raw.encode(), digest_size=16).digest()
+
+    @staticmethod
+    def _trees(value: xJsonT) -> t.List[xJsonT]:
+        # Items hold on to one entry of the "i" list, not to the root
+        return [value, *value.get("i", ())]
+
+    def get(self, key: bytes) -> t.Optional[xJsonT]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: bytes, value: xJsonT) -> None:
+        with self._lock:
+            if key in self._data:
+                self._forget(self._data[key])
+            self._data[key] = value
+            self._keys.update((id(x), key) for x in self._trees(value))
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._forget(self._data.popitem(last=False)[1])
+
+    def _forget(self, value: xJsonT) -> None:
+        for tree in self._trees(value):
+            self._keys.pop(id(tree), None)
+
+    def discard(self, tree: xJsonT) -> None:
+        # drops the entry holding this exact tree so it can be freed, see Item.compact()
+        with self._lock:
+            key = self._keys.get(id(tree))
+            if key is not None:
+                self._forget(self._data.pop(key))
+
+    def info(self) -> DecodeCacheInfo:
+        return DecodeCacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._keys.clear()
+            self.hits = self.misses = 0
+
+ITEM_BYTES_CACHE = DecodeCache()
+
 def parse_item_bytes(raw: str) -> xJsonT:
-    def parse_tag(tag: t.Any) -> t.Any:
-        if isinstance(tag, nbt.TAG_List):
-            return [parse_tag(i) for i in tag.tags]
-        elif isinstance(tag, nbt.TAG_Compound):
-            return {[s:=parse_tag(i), i.name][1]: "\n".join(s) if i.name.lower() == "lore" else parse_item_bytes(base64.b64encode(s).decode()) if isinstance(s, bytearray) else s for i in tag.tags}
-        else:
-            return tag.value
-    tag = nbt.NBTFile(fileobj = io.BytesIO(base64.b64decode(raw)))
-    return parse_tag(tag)
+    if not ITEM_BYTES_CACHE.enabled:
+        return _parse_item_bytes(raw)
+    key = ITEM_BYTES_CACHE.key(raw)
+    result = ITEM_BYTES_CACHE.get(key)
+    if result is None:
+        result = _parse_item_bytes(raw)
+        ITEM_BYTES_CACHE.put(key, result)
+    return result
+
+def _parse_item_bytes(raw: str) -> xJsonT:
+    return nbtreader.loads(base64.b64decode(raw))
 
 def normalize_perks(perks: t.List[xJsonT]) -> t.List[xJsonT]:
     return [{"name": x["name"], "description": clear_text(x["description"])} for x in perks]
@@ -53,36 +153,11 @@ def clear_text(text: str) -> str:
 def get_date(ts: int) -> datetime.datetime:
     return datetime.datetime.fromtimestamp(ts / 1000)
 
-@dataclass
-class CatacombsLevelInfo:
-    exp_from_new_level: float
-    exp_needed_for_new_level: float
-    percent_to_new_level: float
-    current_exp: float
-    current_level: int
-
-def get_catacombs_level(exp: float) -> CatacombsLevelInfo:
-    if exp < 51:
-        return CatacombsLevelInfo(exp, 50, exp*2, exp, 0)
-    data = [*enumerate(map(lambda x: (x[1] > exp, x[1]), [*CATACOMBS_LEVELS.items()]))]
-    for x in data:
-        if x[1][0]:
-            needed = data[x[0]][1][1]-data[x[0]-1][1][1]
-            new_exp = exp-data[x[0]-1][1][1]
-            return CatacombsLevelInfo(round(new_exp, 1), needed, round((new_exp) / needed, 2), round(exp, 1), x[0])
-    level = 50
-    total_exp = exp
-    exp -= 569_809_640.0
-    while True:
-        if exp - 200_000_000 >= 0:
-            exp -= 200_000_000
-            level += 1
-        else:
-            break
-    return CatacombsLevelInfo(exp, 200_000_000, round(exp/200_000_000*100, 2), total_exp, level)
-
 def parse_item_data(lore: str) -> xJsonT:
-    data = clear_text(lore.splitlines()[-1])
+    return parse_item_type(clear_text(lore.splitlines()[-1]))
+
+def parse_item_type(data: str) -> xJsonT:
+    # data is the cleaned last lore line, "a SHINY LEGENDARY DUNGEON SWORD a"
     match = ITEM_TYPE_PATTERN.search(data)
     if match is not None:
         result = match.groupdict()
@@ -129,6 +204,36 @@ def get_rank(data: xJsonT) -> str:
         rank = '[' + rank + ']'
     return rank
 
+def decode_executor(max_workers: t.Optional[int] = None) -> Executor:
+    # threads only scale on free-threaded builds, everywhere else decode in worker processes
+    if not getattr(sys, "_is_gil_enabled", lambda: True)():
+        return ThreadPoolExecutor(max_workers)
+    return ProcessPoolExecutor(max_workers)
+
+def single_flight(func: t.Optional[t.Callable[..., t.Awaitable[T]]] = None, *, normalize: t.Mapping[str, t.Callable[[t.Any], t.Hashable]] = {}) -> t.Any:
+    # concurrent calls with equal arguments share one in-flight call and get its result or exception,
+    # the owner keeps the pending futures in `_inflight`. arguments are bound with their defaults so
+    # f(x) and f(x, None) are equal, normalize maps argument names to key functions like str.casefold
+    if func is None:
+        return functools.partial(single_flight, normalize=normalize)
+    signature = inspect.signature(func)
+    variadic = next((x.name for x in signature.parameters.values() if x.kind is x.VAR_KEYWORD), None) # bound as a dict
+    @functools.wraps(func)
+    async def wrapper(self: t.Any, *args: t.Any, **kwargs: t.Any) -> T:
+        bound = signature.bind(self, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = list(bound.arguments.items())[1:]
+        key = (func.__name__, tuple(
+            (k, normalize[k](v) if k in normalize else tuple(sorted(v.items())) if k == variadic else v) for k, v in arguments
+        ))
+        inflight: t.Dict[t.Hashable, asyncio.Future] = self._inflight
+        future = inflight.get(key)
+        if future is None:
+            future = inflight[key] = asyncio.ensure_future(func(self, *args, **kwargs))
+            future.add_done_callback(lambda _: inflight.pop(key, None))
+        return await asyncio.shield(future)
+    return wrapper
+
 def as_chunks(iterable: t.List[T], n: int) -> t.List[t.List[T]]:
     return [iterable[x:x+n] for x in range(0, len(iterable), n)]
 
@@ -5,13 +5,13 @@ import sys
 import typing as t
 
 import libsb.utils as utils
-from libsb import ApiClient, AuctionItem, ItemRarity
+from libsb import ApiClient, AuctionItem, AuctionSnapshot, ItemRarity
 
 APIKEY = os.environ['HAPIKEY']
 
 async def gemstone_slots(): # items with opened gemstone slots
     async with ApiClient(APIKEY) as client:
-        items = [x for x in await client.fetch_all_auctions() if "Witherborn" in x.lore and not "Wither" in x.name and x.is_alive and x.is_bin and x.gemstone_slots]
+        items = [x async for x in client.iter_auctions() if "Witherborn" in x.lore and not "Wither" in x.name and x.is_alive and x.is_bin and x.gemstone_slots]
         items.sort(key=lambda x: x.starting_bid)
         for x in items[:25]:
             print(x.name, x.starting_bid, x.rarity, x.uuid, x.opened_gemstone_slots)
@@ -75,7 +75,8 @@ async def pets_above_lvl_100(): # pets that can be ugraded and flipped
 async def rat_prices(): # ive invested in rat skins so
     async with ApiClient(APIKEY) as client:
         profit = 0
-        auctions = await client.fetch_all_auctions()
+        snapshot = AuctionSnapshot(client)
+        await snapshot.refresh()
         rats = {
             "PiRate Rat Skin": [1, 37_500_000],
             "Junk Rat Rat Skin": [2, 30_000_000],
@@ -88,12 +89,12 @@ async def rat_prices(): # ive invested in rat skins so
         }
         for name, v in rats.items():
             amount, price = v
-            lowest_rat = client.lowestbin_sort(name, auctions)
-            if not lowest_rat:
+            lowest_rat = snapshot.lowest_bins.lowest_matching(name) # substring match, same as lowestbin_sort
+            if lowest_rat is None:
                 print(f"No skins found: {name}. prob alot price? (bought for {utils.CuteInt(price)} x{amount})")
             else:
-                cur_profit = (lowest_rat[0].starting_bid - price) * amount
-                print(f"lb price: {lowest_rat[0].starting_bid}. bought: {utils.CuteInt(price)} x{amount}. {name} PROFIT: {utils.CuteInt(cur_profit)}")
+                cur_profit = (lowest_rat.starting_bid - price) * amount
+                print(f"lb price: {lowest_rat.starting_bid}. bought: {utils.CuteInt(price)} x{amount}. {name} PROFIT: {utils.CuteInt(cur_profit)}")
                 profit += cur_profit
         print(f"Total Profit: {utils.CuteInt(profit)}")
                 